@@ -1,10 +1,82 @@
+from functools import lru_cache
+from typing import Dict, List
+
+
+@lru_cache(maxsize=None)
+def power_table(power: int) -> Dict[str, int]:
+    """Map each digit character to digit ** power."""
+    return {str(d): d ** power for d in range(10)}
+
+
 def is_armstrong(number: int) -> bool:
     """Return True if number is an Armstrong number."""
     if number < 0:
         return False
-    digits = [int(d) for d in str(number)]
-    power = len(digits)
-    return sum(d ** power for d in digits) == number
+    digits = str(number)
+    table = power_table(len(digits))
+    return sum(map(table.__getitem__, digits)) == number
+
+
+def _armstrong_with_digits(n: int) -> List[int]:
+    """All n-digit Armstrong numbers, found by choosing how many of each digit to use.
+
+    The digit counts are fixed from 9 down to 0. At each step the power sums
+    still reachable form a range; a branch is dropped if that range has no
+    n-digit number, or if the range's common leading digits need more copies
+    of a digit than the chosen counts allow.
+    """
+    pw = [d ** n for d in range(10)]
+    low, high = 10 ** (n - 1), 10 ** n - 1
+    counts = [0] * 10
+    found = []
+
+    def search(d: int, remaining: int, total: int):
+        # counts[d+1:] are fixed and sum to `total`; `remaining` digits <= d are left
+        if d == 0:
+            counts[0] = remaining
+            text = str(total)
+            if all(text.count(str(i)) == counts[i] for i in range(10)):
+                found.append(total)
+            return
+        lo, hi = str(max(total, low)), str(min(total + remaining * pw[d], high))
+        i = 0
+        while i < n and lo[i] == hi[i]:
+            i += 1
+        free = remaining
+        prefix = lo[:i]
+        for ch in set(prefix):
+            k = ord(ch) - 48
+            if k > d:
+                if prefix.count(ch) > counts[k]:
+                    return
+            else:
+                free -= prefix.count(ch)
+                if free < 0:
+                    return
+        p, q = pw[d], pw[d - 1]
+        # only counts c that keep the reachable range within [low, high]
+        c_max = min(remaining, (high - total) // p)
+        c_min = max(0, -((total + remaining * q - low) // (p - q)))
+        for c in range(c_max, c_min - 1, -1):
+            counts[d] = c
+            search(d - 1, remaining - c, total + c * p)
+        counts[d] = 0
+
+    search(9, n, 0)
+    return found
+
+
+def armstrong_numbers(max_digits: int) -> List[int]:
+    """Return all positive Armstrong numbers with at most max_digits digits, sorted.
+
+    Instead of testing every integer, this enumerates digit multisets (the
+    order of digits does not change the power sum) with per-length power
+    tables. There are 88 such numbers in total; the largest has 39 digits.
+    """
+    found = []
+    for n in range(1, max_digits + 1):
+        found.extend(_armstrong_with_digits(n))
+    return sorted(found)
 
 
 def main():
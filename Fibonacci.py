@@ -1,14 +1,89 @@
-def fibonacci_terms(n: int):
-    """Return a list with first n Fibonacci terms (starting 0, 1...)."""
-    if n <= 0:
-        return []
-    seq = [0]
-    if n == 1:
-        return seq
-    seq.append(1)
-    for _ in range(3, n + 1):
-        seq.append(seq[-1] + seq[-2])
-    return seq
+from functools import lru_cache
+from typing import Iterator, Optional, Tuple
+
+# fib_mod only searches for the Pisano period of moduli up to this size
+PISANO_LIMIT = 100_000
+
+
+def _fib_pair(n: int, mod: Optional[int] = None) -> Tuple[int, int]:
+    """Return (F(n), F(n+1)) by fast doubling: O(log n) multiplications."""
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        # F(2k) = F(k) * (2F(k+1) - F(k)),  F(2k+1) = F(k)^2 + F(k+1)^2
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        if mod is not None:
+            c %= mod
+            d %= mod
+        if bit == "1":
+            a, b = d, c + d
+            if mod is not None:
+                b %= mod
+        else:
+            a, b = c, d
+    return a, b
+
+
+def fib(n: int) -> int:
+    """Return the n-th Fibonacci number (F(0) = 0, F(1) = 1)."""
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    return _fib_pair(n)[0]
+
+
+@lru_cache(maxsize=256)
+def pisano_period(m: int) -> int:
+    """Return the period of the Fibonacci sequence modulo m (at most 6m)."""
+    if m == 1:
+        return 1
+    a, b = 0, 1
+    for i in range(1, 6 * m + 1):
+        a, b = b, (a + b) % m
+        if a == 0 and b == 1:
+            return i
+    raise AssertionError("Pisano period not found")  # cannot happen: pi(m) <= 6m
+
+
+def fib_mod(n: int, m: int) -> int:
+    """Return F(n) mod m without computing F(n) itself.
+
+    For moduli up to PISANO_LIMIT, n is first reduced modulo the Pisano period.
+    """
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    if m <= 0:
+        raise ValueError("m must be positive")
+    if m <= PISANO_LIMIT:
+        n %= pisano_period(m)
+    return _fib_pair(n, m)[0] % m
+
+
+def fib_range(start: int, stop: int, step: int = 1) -> Iterator[int]:
+    """Lazily yield F(start), F(start + step), ... for indices below stop.
+
+    Only the current pair of terms is kept, so no list of terms is built.
+    """
+    if start < 0 or step < 1:
+        raise ValueError("start must be non-negative and step positive")
+    if start >= stop:
+        return
+    a, b = _fib_pair(start)
+    if step == 1:
+        for _ in range(start, stop):
+            yield a
+            a, b = b, a + b
+        return
+    # F(i+k) = F(i+1)F(k) + F(i)F(k-1),  F(i+k+1) = F(i+1)F(k+1) + F(i)F(k)
+    fk, fk1 = _fib_pair(step)
+    fkm1 = fk1 - fk
+    for _ in range(start, stop, step):
+        yield a
+        a, b = b * fk + a * fkm1, b * fk1 + a * fk
+
+
+def fibonacci_terms(n: int) -> Iterator[int]:
+    """Lazily yield the first n Fibonacci terms (starting 0, 1...)."""
+    return fib_range(0, max(n, 0))
 
 
 def main():
@@ -18,13 +93,12 @@ def main():
         print("Invalid input. Please enter an integer.")
         return
 
-    series = fibonacci_terms(n)
-    if not series:
+    if n <= 0:
         print("No terms to display.")
     else:
         print(f"Fibonacci series ({n} terms):")
-        print(" ".join(str(x) for x in series))
+        print(" ".join(str(x) for x in fibonacci_terms(n)))
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -13,9 +13,21 @@ Functions provided:
 	- gcd(a, b): returns greatest common divisor using Euclid's algorithm
 	- lcm(a, b): returns lowest common multiple using the relation
 				  lcm(a, b) = abs(a*b) // gcd(a, b) (with lcm(0, b) == 0)
+	- gcd_many(values) / lcm_many(values): reduce over any number of integers
+	- gcd_pairs(a, b) / lcm_pairs(a, b): element-wise over two sequences,
+				  in one vectorised call when given NumPy integer arrays
 """
 
-from typing import Tuple
+import math
+from itertools import islice
+from typing import Iterable, Sequence, Tuple
+
+try:
+	import numpy as np
+except ImportError:  # gcd_pairs/lcm_pairs fall back to math.gcd/math.lcm per pair
+	np = None
+
+_CHUNK = 1024
 
 
 def gcd(a: int, b: int) -> int:
@@ -39,6 +51,63 @@ def lcm(a: int, b: int) -> int:
 	return abs(a // gcd(a, b) * b)
 
 
+def gcd_many(values: Iterable[int]) -> int:
+	"""Return the GCD of all values (0 for no values).
+
+	Values are reduced a chunk at a time with math.gcd, stopping as soon as the
+	GCD reaches 1.
+	"""
+	it = iter(values)
+	result = 0
+	while result != 1:
+		chunk = list(islice(it, _CHUNK))
+		if not chunk:
+			break
+		result = math.gcd(result, *chunk)
+	return result
+
+
+def lcm_many(values: Iterable[int]) -> int:
+	"""Return the LCM of all values (1 for no values, 0 if any value is 0)."""
+	it = iter(values)
+	result = 1
+	while result != 0:
+		chunk = list(islice(it, _CHUNK))
+		if not chunk:
+			break
+		result = math.lcm(result, *chunk)
+	return result
+
+
+def _check_lengths(a: Sequence[int], b: Sequence[int]) -> None:
+	if len(a) != len(b):
+		raise ValueError('Both sequences must have the same length.')
+
+
+def gcd_pairs(a: Sequence[int], b: Sequence[int]):
+	"""Return the element-wise GCD of a and b.
+
+	NumPy arrays are handled in one np.gcd call and give an array; other
+	sequences give a list.
+	"""
+	_check_lengths(a, b)
+	if np is not None and (isinstance(a, np.ndarray) or isinstance(b, np.ndarray)):
+		return np.gcd(a, b)
+	return list(map(math.gcd, a, b))
+
+
+def lcm_pairs(a: Sequence[int], b: Sequence[int]):
+	"""Return the element-wise LCM of a and b (0 where either value is 0).
+
+	NumPy arrays are handled in one np.lcm call; fixed-width results wrap on
+	overflow, so use Python ints (lists) when products may exceed the dtype.
+	"""
+	_check_lengths(a, b)
+	if np is not None and (isinstance(a, np.ndarray) or isinstance(b, np.ndarray)):
+		return np.lcm(a, b)
+	return list(map(math.lcm, a, b))
+
+
 def parse_pair(user_input: str) -> Tuple[int, int]:
 	"""Parse two integers from a string separated by space or comma."""
 	sep = ',' if ',' in user_input else None
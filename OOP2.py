@@ -1,10 +1,26 @@
 """A simple OOP-based expression solver.
 
-This module implements two classes:
+This module implements three classes:
 - ExpressionSolver: safely evaluates arithmetic expressions using AST
 - Expression: represents an expression string and stores the computed result
+- ExpressionBatch: computes many Expressions on a process pool
+
+Supported operators: +, -, *, /, %, //, ** and unary +/-. Only numeric literals and
+named variables (bound at evaluation time) are allowed.
+
+Expressions are validated and compiled once into a tree of closures; compiled
+forms are kept in a bounded LRU cache keyed by the expression text, so
+evaluating the same formula again skips parsing and validation entirely.
+Arithmetic runs on a per-solver numeric backend: "float" (plain int/float,
+the default), "fraction" (exact fractions.Fraction) or "decimal"
+(decimal.Decimal under a configurable context). In the exact modes int/float
+literals and variables are converted first, floats from their shortest repr,
+so 0.1 is exactly 1/10.
+
+Before compiling, an optimisation pass folds constant subtrees, drops
+identities such as x*1 and x-0, and evaluates repeated subtrees only once.
+Boolean variables are treated as the ints 0 and 1.
 
-Supported operators: +, -, *, /, %, //, ** and unary +/-. Only numeric literals are allowed.
 Functions are reusable blocks of code
 Variables are storage place for data
 Library is a collection of functions
@@ -14,10 +30,81 @@ Uses of fuctions, library, etc:
 """
 
 import ast
+import contextlib
+import decimal
+import math
 import operator
-from typing import Union, Optional
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from fractions import Fraction
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Sequence, Tuple, Union, Optional
+
+try:
+    import numpy as np
+except ImportError:  # evaluate_batch falls back to a row-by-row loop
+    np = None
+
+Number = Union[int, float, Fraction, decimal.Decimal]
+NUMBER_TYPES = (int, float, Fraction, decimal.Decimal)
+NUMERIC_BACKENDS = {"float": None, "fraction": Fraction, "decimal": decimal.Decimal}
+
+SAMPLE_EXPRESSIONS = [
+    "2 + 3 * 4",
+    "(1 + 2) / (3 - 1)",
+    "5 - 2 * (3 + 1)",
+    "2 ** 3 + 1",
+    "-5 + 3",
+]
+Compiled = Callable[[Mapping[str, Any]], Number]
+
+
+def _variable_value(name: str, value):
+    """Return a variable's value checked to be numeric, with bools turned into the ints 0/1.
+
+    NumPy numeric scalars and int/float/bool arrays (from evaluate_batch) are
+    accepted too. Converting bools up front means `x*1` and `x` agree, so the
+    optimiser may drop such identities without changing a result's type.
+    """
+    if type(value) is bool:
+        return int(value)
+    if isinstance(value, NUMBER_TYPES):
+        return value
+    if np is not None:
+        if isinstance(value, np.bool_):
+            return int(value)
+        if isinstance(value, np.number):
+            return value
+        if isinstance(value, np.ndarray) and value.dtype.kind in "biuf":
+            return value.astype(np.int64) if value.dtype.kind == "b" else value
+    # e.g. a str or list would turn * into unbounded sequence repetition
+    raise ValueError(f"Variable {name} must be a number, not {type(value).__name__}")
+
+
+class ExpressionLimitError(ValueError):
+    """Raised when an expression exceeds one of the solver's resource limits."""
+
+
+class ExpressionTimeoutError(ExpressionLimitError):
+    """Raised when an evaluation runs past the solver's time budget."""
+
+
+@dataclass
+class OptimizationStats:
+    """Node counts of one expression before and after ExpressionSolver's optimisation pass."""
+    nodes_before: int = 0
+    nodes_after: int = 0       # after constant folding and identity simplification
+    nodes_evaluated: int = 0   # distinct subtrees left after sharing repeated ones
+    folded: int = 0
+    simplified: int = 0
+    shared: int = 0            # repeated subtree occurrences served from a shared slot
+
+    @property
+    def reduction(self) -> float:
+        """Fraction of the original nodes no longer evaluated."""
+        return 1 - self.nodes_evaluated / self.nodes_before if self.nodes_before else 0.0
 
-Number = Union[int, float]
 
 class ExpressionSolver:
     """Evaluate arithmetic expressions safely using Python's AST module."""
@@ -37,44 +124,390 @@ class ExpressionSolver:
         ast.USub: operator.neg,
     }
 
-    def evaluate(self, expression: str) -> Number:
+    def __init__(self, cache_size: int = 1024, max_nodes: int = 10_000, max_depth: int = 250,
+                 max_pow_bits: int = 100_000, time_budget: Optional[float] = None,
+                 optimize: bool = True, numeric: str = "float",
+                 decimal_context: Optional[decimal.Context] = None):
+        """Create a solver with the given limits (None disables a limit).
+
+        - max_nodes: maximum number of expression nodes in the AST
+        - max_depth: maximum nesting depth of the AST
+        - max_pow_bits: maximum estimated size, in bits, of a `**` result,
+          checked before the power is computed
+        - time_budget: seconds allowed per evaluation, checked between operations
+        - optimize: run the constant-folding / subtree-sharing pass before compiling
+        - numeric: "float", "fraction" or "decimal" arithmetic (see module docstring);
+          note Decimal's // and % truncate toward zero, unlike int/float
+        - decimal_context: context for the "decimal" backend (default: a copy of
+          the current context when the solver is created)
+        """
+        if numeric not in NUMERIC_BACKENDS:
+            raise ValueError(f"Unknown numeric backend: {numeric!r} (choose from {', '.join(NUMERIC_BACKENDS)})")
+        self.cache_size = cache_size
+        self.max_nodes = max_nodes
+        self.max_depth = max_depth
+        self.max_pow_bits = max_pow_bits
+        self.time_budget = time_budget
+        self.optimize = optimize
+        self.numeric = numeric
+        self._number_type = NUMERIC_BACKENDS[numeric]
+        # values a constant subtree may fold to without changing the result's type
+        self._folded_types = (int, float) if self._number_type is None else self._number_type
+        self.decimal_context = (decimal_context or decimal.getcontext()).copy() if numeric == "decimal" else None
+        self._cache: "OrderedDict[str, Compiled]" = OrderedDict()
+        self._clock = threading.local()
+
+    def __getstate__(self):
+        # Compiled closures and the thread-local clock cannot be pickled; a copy
+        # sent to another process keeps only the configuration.
+        state = self.__dict__.copy()
+        state["_cache"] = OrderedDict()
+        del state["_clock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._clock = threading.local()
+
+    def evaluate(self, expression: str, variables: Optional[Mapping[str, Any]] = None) -> Number:
         """Evaluate the given expression string and return its numeric result.
 
+        Names in the expression are looked up in `variables`.
+        Raises ValueError for unsupported syntax or types, or an unbound name.
+        """
+        return self.compile(expression)(variables or {})
+
+    def evaluate_batch(self, expression: str, columns: Mapping[str, Sequence]) -> Union[List[Number], Any]:
+        """Evaluate one expression for every row of `columns` (variable name -> values).
+
+        If any column is a NumPy array, the compiled expression runs once over
+        whole arrays and an array is returned. Otherwise the rows of the Python
+        sequences are evaluated in a single loop and a list is returned, keeping
+        exact int semantics (no fixed-width overflow).
+        """
+        compiled = self.compile(expression)
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length")
+        n_rows = lengths.pop() if lengths else 0
+
+        if np is not None and any(isinstance(v, np.ndarray) for v in columns.values()):
+            result = compiled({name: np.asarray(values) for name, values in columns.items()})
+            if np.ndim(result) == 0:
+                result = np.full(n_rows, result)
+            return result
+
+        names = list(columns)
+        env: Dict[str, Any] = {}
+        results = []
+        for row in zip(*(columns[name] for name in names)):
+            env.update(zip(names, row))
+            results.append(compiled(env))
+        if not names:
+            results = [compiled(env)] * n_rows
+        return results
+
+    def compile(self, expression: str) -> Compiled:
+        """Return a callable `f(variables)` computing the expression, using the LRU cache.
+
         Raises ValueError for unsupported syntax or types.
         """
+        compiled = self._cache.get(expression)
+        if compiled is not None:
+            self._cache.move_to_end(expression)
+            return compiled
         try:
             parsed = ast.parse(expression, mode="eval")
         except SyntaxError as exc:
             raise ValueError(f"Invalid expression: {exc}") from exc
-        return self._eval(parsed.body)
+        except (RecursionError, MemoryError) as exc:
+            raise ExpressionLimitError("Expression is too deeply nested to parse") from exc
+        stats = OptimizationStats(nodes_before=self._check_size(parsed.body))
+        tree = parsed.body
+        with self._numeric_context():
+            if self.optimize:
+                if self.time_budget is not None:
+                    # folding computes constant subtrees, so it runs on the same budget
+                    self._clock.deadline = time.perf_counter() + self.time_budget
+                tree = self._fold(tree, stats)
+                counts: Counter = Counter()
+                self._number_subtrees(tree, {}, counts)
+                memo: Dict[int, Compiled] = {}
+                compiled = self._compile(tree, memo, counts)
+                stats.nodes_evaluated = len(memo)
+                stats.shared = sum(n - 1 for n in counts.values())
+                if any(n > 1 for n in counts.values()):
+                    compiled = self._with_slots(compiled)
+            else:
+                compiled = self._compile(tree)
+                stats.nodes_evaluated = stats.nodes_before
+        stats.nodes_after = self._count_nodes(tree)
+        if self.decimal_context is not None:
+            compiled = self._with_decimal_context(compiled)
+        if self.time_budget is not None:
+            compiled = self._with_deadline(compiled)
+        compiled.stats = stats
+        if self.cache_size > 0:
+            self._cache[expression] = compiled
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return compiled
+
+    def explain(self, expression: str) -> OptimizationStats:
+        """Return the optimisation report (node counts before/after) for an expression."""
+        return self.compile(expression).stats
+
+    @staticmethod
+    def _count_nodes(root) -> int:
+        count, stack = 0, [root]
+        while stack:
+            node = stack.pop()
+            count += 1
+            stack.extend(c for c in ast.iter_child_nodes(node) if isinstance(c, ast.expr))
+        return count
+
+    def _check_size(self, root) -> int:
+        """Enforce max_nodes and max_depth without recursing (deep trees would hit the recursion limit).
+
+        Returns the number of expression nodes.
+        """
+        count = 0
+        stack = [(root, 1)]
+        while stack:
+            node, depth = stack.pop()
+            count += 1
+            if self.max_nodes is not None and count > self.max_nodes:
+                raise ExpressionLimitError(f"Expression has more than {self.max_nodes} nodes")
+            if self.max_depth is not None and depth > self.max_depth:
+                raise ExpressionLimitError(f"Expression is nested deeper than {self.max_depth} levels")
+            stack.extend((child, depth + 1) for child in ast.iter_child_nodes(node)
+                         if isinstance(child, ast.expr))
+        return count
 
-    def _eval(self, node) -> Number:
+    def _numeric_context(self):
+        if self.decimal_context is not None:
+            return decimal.localcontext(self.decimal_context)
+        return contextlib.nullcontext()
+
+    def _with_decimal_context(self, compiled: Compiled) -> Compiled:
+        ctx = self.decimal_context
+
+        def in_context(env):
+            with decimal.localcontext(ctx):
+                return compiled(env)
+        return in_context
+
+    def _coerce(self, value):
+        """Convert an int or float to the backend's number type (so 3/2 stays exact)."""
+        if self._number_type is None:
+            return value
+        if type(value) is float:
+            return self._number_type(repr(value))
+        if type(value) is int:
+            return self._number_type(value)
+        return value
+
+    @staticmethod
+    def _is_number(node) -> bool:
+        return isinstance(node, ast.Constant) and isinstance(node.value, NUMBER_TYPES)
+
+    @staticmethod
+    def _is_int_const(node, value: int) -> bool:
+        return isinstance(node, ast.Constant) and type(node.value) is int and node.value == value
+
+    def _fold(self, node, stats: OptimizationStats):
+        """Return a new tree with constant subtrees folded and int identities (x*1, x-0, ...) removed.
+
+        Unsupported nodes are returned untouched, so `_compile` still reports them.
+        In decimal mode no identities are dropped at all: x*1, x-0 and +x are
+        where the Decimal context rounds x.
+        A subtree is only folded when its value keeps the backend's number type
+        (e.g. Fraction ** Fraction can give a float). x+0 is kept, because
+        IEEE -0.0 + 0 is 0.0. Raises ExpressionTimeoutError when time_budget
+        runs out.
+        """
         if isinstance(node, ast.BinOp):
-            left = self._eval(node.left)
-            right = self._eval(node.right)
+            left = self._fold(node.left, stats)
+            right = self._fold(node.right, stats)
+            op_type = type(node.op)
+            func = self._checked_pow if op_type is ast.Pow else self._bin_ops.get(op_type)
+            if func is not None and self._is_number(left) and self._is_number(right):
+                try:
+                    value = func(self._coerce(left.value), self._coerce(right.value))
+                except ArithmeticError:
+                    value = None  # e.g. 1/0: keep it so the error surfaces at evaluation time
+                if self.time_budget is not None and time.perf_counter() > self._clock.deadline:
+                    raise ExpressionTimeoutError(f"Evaluation exceeded {self.time_budget}s budget")
+                if value is not None and isinstance(value, self._folded_types):
+                    stats.folded += 1
+                    return ast.Constant(value)
+            if self.numeric == "decimal":
+                return ast.BinOp(left=left, op=node.op, right=right)
+            # Only exact int 0/1 are dropped: 1.0*x or x/1 could change the result type.
+            if ((op_type is ast.Sub and self._is_int_const(right, 0))
+                    or (op_type is ast.Mult and self._is_int_const(right, 1))
+                    or (op_type is ast.Pow and self._is_int_const(right, 1))):
+                stats.simplified += 1
+                return left
+            if op_type is ast.Mult and self._is_int_const(left, 1):
+                stats.simplified += 1
+                return right
+            return ast.BinOp(left=left, op=node.op, right=right)
+
+        if isinstance(node, ast.UnaryOp):
+            operand = self._fold(node.operand, stats)
+            func = self._unary_ops.get(type(node.op))
+            if func is not None and self._is_number(operand):
+                stats.folded += 1
+                return ast.Constant(func(self._coerce(operand.value)))
+            if isinstance(node.op, ast.UAdd) and func is not None and self.numeric != "decimal":
+                stats.simplified += 1
+                return operand
+            return ast.UnaryOp(op=node.op, operand=operand)
+
+        return node
+
+    def _number_subtrees(self, node, ids: Dict[tuple, int], counts: Counter) -> int:
+        """Give structurally identical subtrees the same id (stored as `node.cse_id`) and count uses."""
+        if isinstance(node, ast.BinOp):
+            key = (type(node.op), self._number_subtrees(node.left, ids, counts),
+                   self._number_subtrees(node.right, ids, counts))
+        elif isinstance(node, ast.UnaryOp):
+            key = (type(node.op), self._number_subtrees(node.operand, ids, counts))
+        elif isinstance(node, ast.Constant):
+            # repr tells apart values that compare equal: 0.0 / -0.0, Decimal 1.0 / 1.00
+            key = ("const", type(node.value), repr(node.value))
+        elif isinstance(node, ast.Name):
+            key = ("name", node.id)
+        else:
+            key = ("node", id(node))
+        node.cse_id = ids.setdefault(key, len(ids))
+        if isinstance(node, (ast.BinOp, ast.UnaryOp)):
+            counts[node.cse_id] += 1
+        return node.cse_id
+
+    @staticmethod
+    def _with_slots(compiled: Compiled) -> Compiled:
+        # Shared subtrees cache their value in a per-evaluation copy of the variables;
+        # slot keys start with "#" so they can never clash with a variable name.
+        return lambda env: compiled(dict(env))
+
+    @staticmethod
+    def _shared(compiled: Compiled, key: str) -> Compiled:
+        def slot(env):
+            try:
+                return env[key]
+            except KeyError:
+                value = env[key] = compiled(env)
+                return value
+        return slot
+
+    @staticmethod
+    def _pow_bits(base, exponent) -> float:
+        """Estimated size in bits of base ** exponent when that is an exact, growing value.
+
+        Only int ** positive int and Fraction ** integral exponent (of either
+        sign) grow without bound. Float results (including int ** negative int),
+        Decimal (rounded to its context) and NumPy arrays are fixed width, so
+        they count as 0 bits. Returns inf when the estimate itself overflows.
+        """
+        try:
+            integral = isinstance(exponent, int) or (isinstance(exponent, Fraction) and exponent.denominator == 1)
+            if not integral or isinstance(base, bool) or not exponent:
+                return 0.0
+            if isinstance(base, Fraction):
+                magnitude = max(abs(base.numerator), base.denominator)
+            elif isinstance(base, int) and exponent > 0:
+                magnitude = abs(base)
+            else:
+                return 0.0
+            return abs(float(exponent)) * math.log2(magnitude) if magnitude > 1 else 0.0
+        except OverflowError:
+            return math.inf  # exponent too large even for a float
+
+    def _checked_pow(self, base, exponent):
+        if self.max_pow_bits is not None:
+            bits = self._pow_bits(base, exponent)
+            if bits > self.max_pow_bits:
+                raise ExpressionLimitError(
+                    f"Result of ** would have about {bits:.3g} bits (limit {self.max_pow_bits})")
+        return operator.pow(base, exponent)
+
+    def _with_deadline(self, compiled: Compiled) -> Compiled:
+        clock, budget = self._clock, self.time_budget
+
+        def timed(env):
+            clock.deadline = time.perf_counter() + budget
+            return compiled(env)
+        return timed
+
+    def _compile(self, node, memo: Optional[Dict[int, Compiled]] = None,
+                 counts: Optional[Counter] = None) -> Compiled:
+        """Compile a node to a closure. With `memo`/`counts` from `_number_subtrees`,
+        identical subtrees share one closure and repeated ones are evaluated once per call."""
+        if memo is None:
+            return self._compile_node(node, None, None)
+        cse_id = node.cse_id
+        if cse_id not in memo:
+            compiled = self._compile_node(node, memo, counts)
+            if counts[cse_id] > 1:
+                compiled = self._shared(compiled, f"#{cse_id}")
+            memo[cse_id] = compiled
+        return memo[cse_id]
+
+    def _compile_node(self, node, memo, counts) -> Compiled:
+        if isinstance(node, ast.BinOp):
+            left = self._compile(node.left, memo, counts)
+            right = self._compile(node.right, memo, counts)
             op_type = type(node.op)
             func = self._bin_ops.get(op_type)
             if func is None:
                 raise ValueError(f"Unsupported binary operator: {op_type.__name__}")
-            return func(left, right)
+            if op_type is ast.Pow:
+                func = self._checked_pow
+            if self.time_budget is not None:
+                clock = self._clock
+
+                def timed_op(env):
+                    result = func(left(env), right(env))
+                    if time.perf_counter() > clock.deadline:
+                        raise ExpressionTimeoutError(f"Evaluation exceeded {self.time_budget}s budget")
+                    return result
+                return timed_op
+            return lambda env: func(left(env), right(env))
 
         if isinstance(node, ast.UnaryOp):
-            operand = self._eval(node.operand)
+            operand = self._compile(node.operand, memo, counts)
             op_type = type(node.op)
             func = self._unary_ops.get(op_type)
             if func is None:
                 raise ValueError(f"Unsupported unary operator: {op_type.__name__}")
-            return func(operand)
+            return lambda env: func(operand(env))
 
         # numeric literal (Python 3.8+: ast.Constant)
         if isinstance(node, ast.Constant):
-            if isinstance(node.value, (int, float)):
-                return node.value
+            if isinstance(node.value, NUMBER_TYPES):
+                value = self._coerce(node.value)
+                return lambda env: value
             raise ValueError("Only int/float constants are allowed")
 
         # legacy numeric node
         if hasattr(ast, 'Num') and isinstance(node, ast.Num):
-            return node.n
+            value = self._coerce(node.n)
+            return lambda env: value
+
+        if isinstance(node, ast.Name):
+            name = node.id
+            coerce = None if self._number_type is None else self._coerce
+
+            def lookup(env):
+                try:
+                    value = env[name]
+                except KeyError:
+                    raise ValueError(f"Undefined variable: {name}") from None
+                value = _variable_value(name, value)
+                return value if coerce is None else coerce(value)
+            return lookup
 
         raise ValueError(f"Unsupported expression node: {type(node).__name__}")
 
@@ -82,29 +515,144 @@ class ExpressionSolver:
 class Expression:
     """Represents an expression and its computed result."""
 
-    def __init__(self, expr: str):
+    def __init__(self, expr: str, variables: Optional[Mapping[str, Any]] = None):
         self.expr = expr
+        self.variables = variables
         self.result: Optional[Number] = None
+        self.error: Optional[Exception] = None
 
     def compute(self, solver: ExpressionSolver) -> Number:
         """Compute and store the result using the provided solver."""
-        self.result = solver.evaluate(self.expr)
+        self.result = solver.evaluate(self.expr, self.variables)
         return self.result
 
 
+_worker_solver: Optional[ExpressionSolver] = None
+
+
+def _init_worker(solver: ExpressionSolver) -> None:
+    global _worker_solver
+    _worker_solver = solver
+
+
+def _evaluate_chunk(items: List[Tuple[str, Optional[Mapping[str, Any]]]],
+                    solver: Optional[ExpressionSolver] = None) -> List[Tuple[bool, Any]]:
+    """Evaluate `(expr, variables)` pairs, returning `(ok, result or exception)` per item."""
+    solver = solver or _worker_solver
+    out = []
+    for expr, variables in items:
+        try:
+            out.append((True, solver.evaluate(expr, variables)))
+        except Exception as exc:
+            out.append((False, exc))
+    return out
+
+
+class ExpressionBatch:
+    """Computes many Expression objects, in order, on a process pool.
+
+    Expressions are sent to the workers in chunks; each worker keeps its own
+    solver (and compile cache) for the whole batch. A failing expression does
+    not abort the batch: its exception is stored on `Expression.error` and its
+    result is left as None.
+    """
+
+    def __init__(self, expressions: Iterable[Expression], solver: Optional[ExpressionSolver] = None,
+                 max_workers: Optional[int] = None, chunksize: int = 256):
+        self.expressions = list(expressions)
+        self.solver = solver or ExpressionSolver()
+        self.max_workers = max_workers
+        self.chunksize = chunksize
+
+    def compute(self) -> List[Optional[Number]]:
+        """Compute every expression and return the results in input order (None for failures)."""
+        items = [(e.expr, e.variables) for e in self.expressions]
+        chunks = [items[i:i + self.chunksize] for i in range(0, len(items), self.chunksize)]
+        if len(chunks) <= 1 or self.max_workers == 1:
+            # not worth starting processes for
+            outcomes = [_evaluate_chunk(chunk, self.solver) for chunk in chunks]
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                     initargs=(self.solver,)) as pool:
+                outcomes = list(pool.map(_evaluate_chunk, chunks))
+
+        results = []
+        flat = (outcome for chunk in outcomes for outcome in chunk)
+        for expression, (ok, value) in zip(self.expressions, flat):
+            expression.result, expression.error = (value, None) if ok else (None, value)
+            results.append(expression.result)
+        return results
+
+
+# (expression, variables) pairs where a careless optimiser would change the result
+OPTIMIZER_CHECKS = [
+    ("x + 0", {"x": 10 ** 30 + 1}),
+    ("x * 1 + 0 + (y - 0)", {"x": 1.234567, "y": -0.0}),
+    ("x * 1", {"x": 1.234567}),
+    ("x - 0", {"x": 10 ** 30 + 1}),
+    ("+x", {"x": 1.234567}),
+    ("x ** 1", {"x": -0.0}),
+    ("(x * 0.0) ** 0 * (x * -0.0)", {"x": 1.0}),
+    ("2 * x + 2 * x - 1 * y", {"x": True, "y": 3}),
+    ("0.1 + 0.2 + x", {"x": 0}),
+    ("2 ** 0.5 + x", {"x": 1}),
+]
+
+
+def _outcome(solver: ExpressionSolver, expression: str, variables: Mapping[str, Any]) -> Tuple[str, str]:
+    try:
+        value = solver.evaluate(expression, variables)
+    except Exception as exc:
+        return ("error", type(exc).__name__)
+    return (type(value).__name__, repr(value))
+
+
+def check_optimizer(cases: Sequence[Tuple[str, Mapping[str, Any]]] = OPTIMIZER_CHECKS) -> List[str]:
+    """Evaluate every case with optimize on and off for each backend; return the mismatches.
+
+    Results must agree in type and repr (so 0.0 vs -0.0 counts). Decimal is
+    checked under the default context and under a 5-digit one.
+    """
+    configs = [(backend, None) for backend in NUMERIC_BACKENDS] + [("decimal", decimal.Context(prec=5))]
+    mismatches = []
+    for backend, context in configs:
+        on = ExpressionSolver(numeric=backend, decimal_context=context)
+        off = ExpressionSolver(numeric=backend, decimal_context=context, optimize=False)
+        label = backend if context is None else f"{backend}(prec={context.prec})"
+        for expression, variables in cases:
+            got, expected = _outcome(on, expression, variables), _outcome(off, expression, variables)
+            if got != expected:
+                mismatches.append(f"{label}: {expression} with {variables}: {got[1]} != {expected[1]}")
+    return mismatches
+
+
+def benchmark_backends(expressions: Sequence[str] = SAMPLE_EXPRESSIONS,
+                       repeat: int = 20_000) -> Dict[str, Tuple[float, List[Number]]]:
+    """Time each numeric backend on `expressions`.
+
+    Returns `{backend: (evaluations per second, results)}`. Constant folding is
+    disabled so the arithmetic itself is measured, not a cached constant.
+    """
+    report = {}
+    for backend in NUMERIC_BACKENDS:
+        solver = ExpressionSolver(numeric=backend, optimize=False)
+        compiled = [solver.compile(e) for e in expressions]
+        results = [f({}) for f in compiled]
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for f in compiled:
+                f({})
+        elapsed = time.perf_counter() - start
+        report[backend] = (repeat * len(compiled) / elapsed, results)
+    return report
+
+
 def main() -> None:
     solver = ExpressionSolver()
 
-    samples = [
-        "2 + 3 * 4",
-        "(1 + 2) / (3 - 1)",
-        "5 - 2 * (3 + 1)",
-        "2 ** 3 + 1",
-        "-5 + 3",
-    ]
-
     print("Example evaluations:")
-    for s in samples:
+    for s in SAMPLE_EXPRESSIONS:
         expr = Expression(s)
         try:
             print(f"{s} = {expr.compute(solver)}")
@@ -125,4 +673,14 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    import sys
+
+    if "--benchmark" in sys.argv[1:]:
+        mismatches = check_optimizer()
+        print("optimizer check:", "ok" if not mismatches else "")
+        for line in mismatches:
+            print("  " + line)
+        for backend, (rate, results) in benchmark_backends().items():
+            print(f"{backend:>8}: {rate:>12,.0f} evals/s  {[str(r) for r in results]}")
+    else:
+        main()
@@ -6,24 +6,116 @@ Classes:
 - Rectangle
 - Square
 - RegularPolygon (n-sided regular polygon)
+- VertexPolygon (arbitrary simple polygon from a flat x0, y0, x1, y1, ... buffer)
 
-Run this file directly for an interactive demo and examples.
+Column-oriented batches (NumPy, optional) for computing many shapes at once:
+- TriangleArray, RectangleArray, SquareArray, RegularPolygonArray
+- PackedPolygons (many vertex polygons as offsets + coordinates, optionally
+  memory-mapped from a file)
+
+Shapes are immutable, use __slots__ and memoise area() and perimeter() after
+the first call; `shape.replace(width=...)` builds a changed copy.
+
+Shapes with a position (Rectangle, Square, VertexPolygon) report `bbox()`;
+`polygon_index.STRTree` indexes collections of them for window, point and
+nearest-neighbour queries.
+
+Run this file directly for an interactive demo and examples
+(`--benchmark` times and sizes one million shape instances instead).
+
+Batch mode streams shape records from an NDJSON or CSV file (or stdin) and
+writes one result per record, a chunk at a time:
+
+    python Polygon.py --batch shapes.ndjson [--output results.csv] [--format csv]
+    python Polygon.py --batch - --input-format csv < shapes.csv
+
+Records name a `shape` (triangle, rectangle, square or regular) and its
+constructor fields, e.g. {"shape": "triangle", "a": 3, "b": 4, "c": 5} or the
+CSV row `shape,a,b,c` / `triangle,3,4,5`; an optional `id` is passed through.
 """
 
 from __future__ import annotations
+import argparse
+import csv
+import json
 import math
-from typing import Optional
+import os
+import struct
+import sys
+import time
+import tracemalloc
+from operator import attrgetter
+from itertools import islice
+from typing import IO, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # the *Array batch classes need NumPy; the scalar classes do not
+    np = None
+
+
+def _readonly(slot: str) -> property:
+    """Public read-only view of a private slot."""
+    return property(attrgetter(slot))
+
+
+def _rebuild(cls, kwargs):
+    return cls(**kwargs)
 
 
 class Polygon:
-    """Abstract base class for polygons."""
+    """Abstract base class for polygons.
 
-    def area(self) -> float:
+    Shapes are immutable: fields live in private slots behind read-only
+    properties. Subclasses implement `_compute_area()` and
+    `_compute_perimeter()`; each result is stored on first use, and
+    `replace()` is the only way to get a shape with different values.
+    """
+
+    __slots__ = ("_area", "_perimeter")
+
+    def __init__(self):
+        # subclasses set this themselves instead of calling super().__init__()
+        self._area = self._perimeter = None
+
+    def _init_args(self) -> dict:
+        """Constructor keyword arguments that rebuild this shape."""
+        raise NotImplementedError("Subclasses must implement _init_args()")
+
+    def replace(self, **changes) -> "Polygon":
+        """Return a new shape with some constructor arguments changed (and an empty cache)."""
+        kwargs = self._init_args()
+        unknown = set(changes) - set(kwargs)
+        if unknown:
+            raise TypeError(f"Unknown fields for {self.__class__.__name__}: {', '.join(sorted(unknown))}")
+        kwargs.update(changes)
+        return self.__class__(**kwargs)
+
+    def __reduce__(self):
+        return (_rebuild, (self.__class__, self._init_args()))
+
+    def _compute_area(self) -> float:
         raise NotImplementedError("Subclasses must implement area()")
 
-    def perimeter(self) -> float:
+    def _compute_perimeter(self) -> float:
         raise NotImplementedError("Subclasses must implement perimeter()")
 
+    def area(self) -> float:
+        value = self._area
+        if value is None:
+            value = self._area = self._compute_area()
+        return value
+
+    def perimeter(self) -> float:
+        value = self._perimeter
+        if value is None:
+            value = self._perimeter = self._compute_perimeter()
+        return value
+
+    def bbox(self) -> Tuple[float, float, float, float]:
+        """Return (min_x, min_y, max_x, max_y); only shapes with a position have one."""
+        raise NotImplementedError(f"{self.__class__.__name__} has no position")
+
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__}>"
 
@@ -36,33 +128,45 @@ class Triangle(Polygon):
         Triangle(a=3, b=4, c=5)
     """
 
+    __slots__ = ("_base", "_height", "_a", "_b", "_c")
+    base = _readonly("_base")
+    height = _readonly("_height")
+    a = _readonly("_a")
+    b = _readonly("_b")
+    c = _readonly("_c")
+
     def __init__(self, *, base: Optional[float] = None, height: Optional[float] = None,
                  a: Optional[float] = None, b: Optional[float] = None, c: Optional[float] = None):
-        self.base = base
-        self.height = height
-        self.a = a
-        self.b = b
-        self.c = c
-
         if (a is None or b is None or c is None) and (base is None or height is None):
             raise ValueError("Provide either (base and height) or (a, b, c) side lengths")
-
-    def area(self) -> float:
-        if self.base is not None and self.height is not None:
-            return 0.5 * self.base * self.height
+        if base is not None and height is not None and (base <= 0 or height <= 0):
+            raise ValueError("Base and height must be positive")
+        self._base = base
+        self._height = height
+        self._a = a
+        self._b = b
+        self._c = c
+        self._area = self._perimeter = None
+
+    def _init_args(self) -> dict:
+        return dict(base=self._base, height=self._height, a=self._a, b=self._b, c=self._c)
+
+    def _compute_area(self) -> float:
+        if self._base is not None and self._height is not None:
+            return 0.5 * self._base * self._height
         # Heron's formula
-        a, b, c = float(self.a), float(self.b), float(self.c)
+        a, b, c = float(self._a), float(self._b), float(self._c)
         s = 0.5 * (a + b + c)
         if s <= a or s <= b or s <= c:
             raise ValueError("Invalid triangle side lengths")
         return math.sqrt(s * (s - a) * (s - b) * (s - c))
 
-    def perimeter(self) -> float:
-        if self.a is not None and self.b is not None and self.c is not None:
-            return self.a + self.b + self.c
-        if self.base is not None and self.height is not None:
+    def _compute_perimeter(self) -> float:
+        if self._a is not None and self._b is not None and self._c is not None:
+            return self._a + self._b + self._c
+        if self._base is not None and self._height is not None:
             # Perimeter unknown; return base as a partial indicator
-            return float(self.base)
+            return float(self._base)
         raise ValueError("Insufficient data for perimeter")
 
     def __str__(self) -> str:
@@ -70,27 +174,52 @@ class Triangle(Polygon):
 
 
 class Rectangle(Polygon):
-    def __init__(self, width: float, height: float):
+    """Axis-aligned rectangle; (x, y) is its lower-left corner."""
+
+    __slots__ = ("_width", "_height", "_x", "_y")
+    width = _readonly("_width")
+    height = _readonly("_height")
+    x = _readonly("_x")
+    y = _readonly("_y")
+
+    def __init__(self, width: float, height: float, *, x: float = 0.0, y: float = 0.0):
         if width <= 0 or height <= 0:
             raise ValueError("Width and height must be positive")
-        self.width = float(width)
-        self.height = float(height)
+        self._width = float(width)
+        self._height = float(height)
+        self._x = float(x)
+        self._y = float(y)
+        self._area = self._perimeter = None
 
-    def area(self) -> float:
-        return self.width * self.height
+    def _init_args(self) -> dict:
+        return dict(width=self._width, height=self._height, x=self._x, y=self._y)
 
-    def perimeter(self) -> float:
-        return 2 * (self.width + self.height)
+    def _compute_area(self) -> float:
+        return self._width * self._height
+
+    def _compute_perimeter(self) -> float:
+        return 2 * (self._width + self._height)
+
+    def bbox(self) -> Tuple[float, float, float, float]:
+        return (self._x, self._y, self._x + self._width, self._y + self._height)
+
+    def contains(self, x: float, y: float) -> bool:
+        return self._x <= x <= self._x + self._width and self._y <= y <= self._y + self._height
 
     def __str__(self) -> str:
         return f"Rectangle(width={self.width}, height={self.height}, area={self.area():.4f})"
 
 
 class Square(Rectangle):
-    def __init__(self, side: float):
+    __slots__ = ()
+
+    def __init__(self, side: float, *, x: float = 0.0, y: float = 0.0):
         if side <= 0:
             raise ValueError("Side must be positive")
-        super().__init__(side, side)
+        super().__init__(side, side, x=x, y=y)
+
+    def _init_args(self) -> dict:
+        return dict(side=self._width, x=self._x, y=self._y)
 
     def __str__(self) -> str:
         return f"Square(side={self.width}, area={self.area():.4f})"
@@ -99,25 +228,525 @@ class Square(Rectangle):
 class RegularPolygon(Polygon):
     """Regular polygon with n sides of equal length."""
 
+    __slots__ = ("_n", "_s")
+    n = _readonly("_n")
+    s = _readonly("_s")
+
     def __init__(self, n_sides: int, side_length: float):
         if n_sides < 3:
             raise ValueError("A polygon must have at least 3 sides")
         if side_length <= 0:
             raise ValueError("Side length must be positive")
-        self.n = int(n_sides)
-        self.s = float(side_length)
+        self._n = int(n_sides)
+        self._s = float(side_length)
+        self._area = self._perimeter = None
 
-    def perimeter(self) -> float:
-        return self.n * self.s
+    def _init_args(self) -> dict:
+        return dict(n_sides=self._n, side_length=self._s)
 
-    def area(self) -> float:
+    def _compute_perimeter(self) -> float:
+        return self._n * self._s
+
+    def _compute_area(self) -> float:
         # Formula: (n * s^2) / (4 * tan(pi/n))
-        return (self.n * (self.s ** 2)) / (4.0 * math.tan(math.pi / self.n))
+        return (self._n * (self._s ** 2)) / (4.0 * math.tan(math.pi / self._n))
 
     def __str__(self) -> str:
         return f"RegularPolygon(n={self.n}, side={self.s}, area={self.area():.4f})"
 
 
+class VertexPolygon(Polygon):
+    """Simple polygon given by a flat coordinate buffer x0, y0, x1, y1, ...
+
+    The buffer (array.array('d'), memoryview, NumPy array or any sequence) is
+    referenced, not copied. Area (shoelace formula), perimeter and centroid
+    are computed together in one pass over the vertices by `measure()` and
+    memoised, so the buffer must not be modified while the polygon is in use.
+    """
+
+    __slots__ = ("_coords", "_measured")
+    coords = _readonly("_coords")
+
+    def __init__(self, coords):
+        if len(coords) % 2:
+            raise ValueError("Coordinate buffer must hold x, y pairs")
+        if len(coords) < 6:
+            raise ValueError("A polygon must have at least 3 vertices")
+        self._coords = coords
+        self._area = self._perimeter = self._measured = None
+
+    def _init_args(self) -> dict:
+        return dict(coords=self._coords)
+
+    @property
+    def n_vertices(self) -> int:
+        return len(self.coords) // 2
+
+    def measure(self) -> Tuple[float, float, Tuple[float, float]]:
+        """Return (area, perimeter, centroid) from a single pass over the vertices."""
+        measured = self._measured
+        if measured is None:
+            measured = self._measured = self._measure()
+        return measured
+
+    def _measure(self) -> Tuple[float, float, Tuple[float, float]]:
+        if np is not None:
+            # a view for float64 buffers; ints, float32 etc. are converted by value
+            return _measure_vertices(np.asarray(self.coords, dtype=np.float64))
+        buf = self.coords
+        x0, y0 = buf[-2], buf[-1]
+        twice_area = perimeter = cx = cy = 0.0
+        for i in range(0, len(buf), 2):
+            x1, y1 = buf[i], buf[i + 1]
+            cross = x0 * y1 - x1 * y0
+            twice_area += cross
+            cx += (x0 + x1) * cross
+            cy += (y0 + y1) * cross
+            perimeter += math.hypot(x1 - x0, y1 - y0)
+            x0, y0 = x1, y1
+        if twice_area == 0:
+            n = len(buf) // 2
+            return 0.0, perimeter, (sum(buf[0::2]) / n, sum(buf[1::2]) / n)
+        return abs(twice_area) / 2, perimeter, (cx / (3 * twice_area), cy / (3 * twice_area))
+
+    def area(self) -> float:
+        return self.measure()[0]
+
+    def perimeter(self) -> float:
+        return self.measure()[1]
+
+    def centroid(self) -> Tuple[float, float]:
+        return self.measure()[2]
+
+    def bbox(self) -> Tuple[float, float, float, float]:
+        xs, ys = self.coords[0::2], self.coords[1::2]
+        return (float(min(xs)), float(min(ys)), float(max(xs)), float(max(ys)))
+
+    def contains(self, x: float, y: float) -> bool:
+        """Even-odd ray casting test (points exactly on an edge may go either way)."""
+        buf = self.coords
+        inside = False
+        x0, y0 = buf[-2], buf[-1]
+        for i in range(0, len(buf), 2):
+            x1, y1 = buf[i], buf[i + 1]
+            if (y1 > y) != (y0 > y) and x < x0 + (y - y0) * (x1 - x0) / (y1 - y0):
+                inside = not inside
+            x0, y0 = x1, y1
+        return inside
+
+    def __str__(self) -> str:
+        area, perimeter, _ = self.measure()
+        return f"VertexPolygon(n={self.n_vertices}, area={area:.4f}, perimeter={perimeter:.4f})"
+
+
+def _measure_vertices(flat) -> Tuple[float, float, Tuple[float, float]]:
+    x, y = flat[0::2], flat[1::2]
+    xn, yn = np.roll(x, -1), np.roll(y, -1)
+    cross = x * yn - xn * y
+    twice_area = float(cross.sum())
+    perimeter = float(np.hypot(xn - x, yn - y).sum())
+    if twice_area == 0:
+        return 0.0, perimeter, (float(x.mean()), float(y.mean()))
+    cx = float(((x + xn) * cross).sum()) / (3 * twice_area)
+    cy = float(((y + yn) * cross).sum()) / (3 * twice_area)
+    return abs(twice_area) / 2, perimeter, (cx, cy)
+
+
+class PolygonArray:
+    """Abstract base for batches of shapes stored as NumPy columns.
+
+    `area()` and `perimeter()` compute the whole batch in one vectorised
+    expression. Instead of raising ValueError per shape, invalid rows are
+    flagged in the boolean `valid` mask and come out as NaN.
+    """
+
+    valid: "np.ndarray"
+
+    def __init__(self):
+        if np is None:
+            raise ImportError("NumPy is required for the *Array polygon classes")
+
+    @staticmethod
+    def _column(values) -> "np.ndarray":
+        return np.asarray(values, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.valid)
+
+    def _masked(self, values) -> "np.ndarray":
+        return np.where(self.valid, values, np.nan)
+
+    def area(self) -> "np.ndarray":
+        raise NotImplementedError("Subclasses must implement area()")
+
+    def perimeter(self) -> "np.ndarray":
+        raise NotImplementedError("Subclasses must implement perimeter()")
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} n={len(self)} valid={int(self.valid.sum())}>"
+
+
+class TriangleArray(PolygonArray):
+    """Triangles from base and height columns, or from three side-length columns a, b, c."""
+
+    def __init__(self, *, base=None, height=None, a=None, b=None, c=None):
+        super().__init__()
+        self.base = self.height = self.a = self.b = self.c = None
+        if a is not None and b is not None and c is not None:
+            self.a, self.b, self.c = self._column(a), self._column(b), self._column(c)
+            s = 0.5 * (self.a + self.b + self.c)
+            # Heron: every side must be shorter than the semi-perimeter
+            self.valid = (s > self.a) & (s > self.b) & (s > self.c)
+        elif base is not None and height is not None:
+            self.base, self.height = self._column(base), self._column(height)
+            self.valid = (self.base > 0) & (self.height > 0)
+        else:
+            raise ValueError("Provide either (base and height) or (a, b, c) side lengths")
+
+    def area(self) -> "np.ndarray":
+        if self.base is not None:
+            return self._masked(0.5 * self.base * self.height)
+        s = 0.5 * (self.a + self.b + self.c)
+        with np.errstate(invalid="ignore"):
+            return self._masked(np.sqrt(s * (s - self.a) * (s - self.b) * (s - self.c)))
+
+    def perimeter(self) -> "np.ndarray":
+        if self.a is not None:
+            return self._masked(self.a + self.b + self.c)
+        # Perimeter unknown; return base as a partial indicator (as Triangle does)
+        return self._masked(self.base)
+
+
+class RectangleArray(PolygonArray):
+    def __init__(self, width, height):
+        super().__init__()
+        self.width = self._column(width)
+        self.height = self._column(height)
+        self.valid = (self.width > 0) & (self.height > 0)
+
+    def area(self) -> "np.ndarray":
+        return self._masked(self.width * self.height)
+
+    def perimeter(self) -> "np.ndarray":
+        return self._masked(2 * (self.width + self.height))
+
+
+class SquareArray(RectangleArray):
+    def __init__(self, side):
+        super().__init__(side, side)
+
+
+class RegularPolygonArray(PolygonArray):
+    """Regular polygons with n_sides[i] sides of length side_length[i]."""
+
+    def __init__(self, n_sides, side_length):
+        super().__init__()
+        self.n = np.asarray(n_sides, dtype=np.int64)
+        self.s = self._column(side_length)
+        self.valid = (self.n >= 3) & (self.s > 0)
+
+    def perimeter(self) -> "np.ndarray":
+        return self._masked(self.n * self.s)
+
+    def area(self) -> "np.ndarray":
+        # Formula: (n * s^2) / (4 * tan(pi/n)); invalid n (e.g. 0) is masked out
+        n = np.where(self.valid, self.n, 3)
+        return self._masked((n * self.s ** 2) / (4.0 * np.tan(np.pi / n)))
+
+
+class PackedPolygons:
+    """Many vertex polygons in two flat NumPy buffers.
+
+    Polygon i owns vertices offsets[i]:offsets[i + 1] of `coords`, which holds
+    x, y pairs. Batches are measured a chunk of vertices at a time, so memory
+    use stays bounded even for millions of polygons. `save`/`open` use a file
+    layout that can be memory-mapped directly:
+
+        8-byte magic | uint64 n_polygons | uint64 n_vertices |
+        int64 offsets[n_polygons + 1] | float64 coords[2 * n_vertices]
+    """
+
+    MAGIC = b"PPOLY1\0\0"
+    CHUNK_VERTICES = 1 << 20
+
+    def __init__(self, offsets, coords):
+        if np is None:
+            raise ImportError("NumPy is required for PackedPolygons")
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.coords = np.asarray(coords, dtype=np.float64)
+        if len(self.coords) != 2 * int(self.offsets[-1]):
+            raise ValueError("offsets[-1] must equal the number of vertices in coords")
+        if len(self.offsets) > 1 and int(np.diff(self.offsets).min()) < 3:
+            raise ValueError("Every polygon must have at least 3 vertices")
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> VertexPolygon:
+        start, stop = int(self.offsets[i]), int(self.offsets[i + 1])
+        return VertexPolygon(self.coords[2 * start:2 * stop])
+
+    def _chunks(self):
+        """Yield (first, last) polygon index ranges of about CHUNK_VERTICES vertices."""
+        first = 0
+        while first < len(self):
+            target = self.offsets[first] + self.CHUNK_VERTICES
+            last = max(int(np.searchsorted(self.offsets, target, side="right")) - 1, first + 1)
+            last = min(last, len(self))
+            yield first, last
+            first = last
+
+    def measure(self) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        """Return (areas, perimeters, centroids of shape (n, 2)) for every polygon."""
+        n = len(self)
+        areas, perimeters = np.empty(n), np.empty(n)
+        centroids = np.empty((n, 2))
+        for first, last in self._chunks():
+            offs = self.offsets[first:last + 1] - self.offsets[first]
+            v0, v1 = int(self.offsets[first]), int(self.offsets[last])
+            x, y = self.coords[2 * v0:2 * v1:2], self.coords[2 * v0 + 1:2 * v1:2]
+            # index of each vertex's successor, wrapping to the polygon's first vertex
+            nxt = np.arange(1, len(x) + 1)
+            nxt[offs[1:] - 1] = offs[:-1]
+            xn, yn = x[nxt], y[nxt]
+            cross = x * yn - xn * y
+            starts = offs[:-1]
+            twice = np.add.reduceat(cross, starts)
+            perimeters[first:last] = np.add.reduceat(np.hypot(xn - x, yn - y), starts)
+            areas[first:last] = np.abs(twice) / 2
+            counts = np.diff(offs)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                cx = np.add.reduceat((x + xn) * cross, starts) / (3 * twice)
+                cy = np.add.reduceat((y + yn) * cross, starts) / (3 * twice)
+            degenerate = twice == 0
+            if degenerate.any():
+                cx = np.where(degenerate, np.add.reduceat(x, starts) / counts, cx)
+                cy = np.where(degenerate, np.add.reduceat(y, starts) / counts, cy)
+            centroids[first:last, 0], centroids[first:last, 1] = cx, cy
+        return areas, perimeters, centroids
+
+    def area(self) -> "np.ndarray":
+        return self.measure()[0]
+
+    def perimeter(self) -> "np.ndarray":
+        return self.measure()[1]
+
+    def bboxes(self) -> "np.ndarray":
+        """Return an (n, 4) array of (min_x, min_y, max_x, max_y) per polygon."""
+        starts = self.offsets[:-1]
+        x, y = self.coords[0::2], self.coords[1::2]
+        return np.column_stack([np.minimum.reduceat(x, starts), np.minimum.reduceat(y, starts),
+                                np.maximum.reduceat(x, starts), np.maximum.reduceat(y, starts)])
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as fh:
+            fh.write(self.MAGIC)
+            fh.write(struct.pack("<QQ", len(self), len(self.coords) // 2))
+            fh.write(self.offsets.astype("<i8").tobytes())
+            fh.write(self.coords.astype("<f8").tobytes())
+
+    @classmethod
+    def open(cls, path: str) -> "PackedPolygons":
+        """Memory-map a file written by `save`; nothing is read until it is used."""
+        if np is None:
+            raise ImportError("NumPy is required for PackedPolygons")
+        with open(path, "rb") as fh:
+            header = fh.read(24)
+        if header[:8] != cls.MAGIC:
+            raise ValueError(f"{path} is not a packed polygon file")
+        n_polygons, n_vertices = struct.unpack("<QQ", header[8:])
+        offsets = np.memmap(path, dtype="<i8", mode="r", offset=24, shape=(n_polygons + 1,))
+        coords = np.memmap(path, dtype="<f8", mode="r", offset=24 + 8 * (n_polygons + 1),
+                           shape=(2 * n_vertices,))
+        return cls(offsets, coords)
+
+
+def benchmark_instances(n: int = 1_000_000) -> None:
+    """Report memory per instance and area() timings for n shapes of each kind."""
+    makers = {
+        "Triangle": lambda i: Triangle(a=3 + i % 7, b=4 + i % 7, c=5 + i % 7),
+        "Rectangle": lambda i: Rectangle(1 + i % 10, 2 + i % 7),
+        "RegularPolygon": lambda i: RegularPolygon(3 + i % 9, 1 + i % 4),
+    }
+    for name, make in makers.items():
+        start = time.perf_counter()
+        shapes = [make(i) for i in range(n)]
+        built = time.perf_counter() - start
+        start = time.perf_counter()
+        total = sum(s.area() for s in shapes)
+        first = time.perf_counter() - start
+        start = time.perf_counter()
+        total = sum(s.area() for s in shapes)
+        again = time.perf_counter() - start
+        del shapes
+        # memory is traced on a separate run, since tracing slows allocation down
+        tracemalloc.start()
+        shapes = [make(i) for i in range(n)]
+        for s in shapes:
+            s.area()
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        per_instance = (size - sys.getsizeof(shapes)) / n
+        del shapes
+        print(f"{name:15} {per_instance:4.0f} B/instance  build {built:.2f}s  "
+              f"area() first {first:.2f}s  cached {again:.2f}s  (sum {total:.1f})")
+
+
+# Batch mode: shape name -> (scalar class, *Array class, accepted field sets)
+BATCH_SHAPES = {
+    "triangle": (Triangle, TriangleArray, (("a", "b", "c"), ("base", "height"))),
+    "rectangle": (Rectangle, RectangleArray, (("width", "height"),)),
+    "square": (Square, SquareArray, (("side",),)),
+    "regular": (RegularPolygon, RegularPolygonArray, (("n_sides", "side_length"),)),
+}
+BATCH_CHUNK = 65536
+BATCH_COLUMNS = ("id", "shape", "area", "perimeter", "error")
+_json_decode = json.JSONDecoder().decode
+_json_encode = json.JSONEncoder().encode
+
+
+def read_shape_records(stream: IO[str], fmt: str) -> Iterator[dict]:
+    """Lazily yield one dict per NDJSON line or CSV row (empty CSV cells are dropped).
+
+    A line that is not valid JSON yields {"_error": ...} so that it is
+    reported in the output instead of stopping the run.
+    """
+    if fmt == "csv":
+        for row in csv.DictReader(stream):
+            yield {k: v for k, v in row.items() if k is not None and v not in ("", None)}
+        return
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            record = _json_decode(line)
+        except ValueError as exc:
+            record = {"_error": f"invalid JSON: {exc}"}
+        yield record if isinstance(record, dict) else {"_error": "record is not an object"}
+
+
+def _parse_record(record: dict) -> Tuple[str, Tuple[str, ...], Tuple[float, ...]]:
+    """Return (shape, field names, values) or raise ValueError."""
+    if "_error" in record:
+        raise ValueError(record["_error"])
+    shape = str(record.get("shape", "")).strip().lower()
+    if shape not in BATCH_SHAPES:
+        raise ValueError(f"unknown shape {shape!r}")
+    for fields in BATCH_SHAPES[shape][2]:
+        try:
+            return shape, fields, tuple([float(record[f]) for f in fields])
+        except KeyError:
+            continue  # try the next accepted field set
+        except (TypeError, ValueError):
+            raise ValueError(f"non-numeric field in {', '.join(fields)}") from None
+    options = " or ".join("(" + ", ".join(f) + ")" for f in BATCH_SHAPES[shape][2])
+    raise ValueError(f"{shape} needs {options}")
+
+
+def _checked_result(area: float, perimeter: float) -> Tuple[float, float, Optional[str]]:
+    if math.isfinite(area) and math.isfinite(perimeter):
+        return area, perimeter, None
+    return math.nan, math.nan, "area or perimeter is not finite"
+
+
+def measure_records(records: List[dict]) -> List[Tuple[float, float, Optional[str]]]:
+    """Return (area, perimeter, error) per record.
+
+    Records are grouped by shape and field set, and each group is computed
+    with one *Array; without NumPy the scalar classes are used instead.
+    Results that overflow to inf (or come out NaN) are reported as errors.
+    """
+    results: List[Tuple[float, float, Optional[str]]] = [(math.nan, math.nan, None)] * len(records)
+    groups = {}
+    for i, record in enumerate(records):
+        try:
+            shape, fields, values = _parse_record(record)
+        except ValueError as exc:
+            results[i] = (math.nan, math.nan, str(exc))
+            continue
+        if np is None:
+            try:
+                obj = BATCH_SHAPES[shape][0](**dict(zip(fields, values)))
+                results[i] = _checked_result(obj.area(), obj.perimeter())
+            except OverflowError:  # e.g. float ** raises where NumPy gives inf
+                results[i] = _checked_result(math.inf, math.inf)
+            except ValueError as exc:
+                results[i] = (math.nan, math.nan, str(exc))
+            continue
+        indices, rows = groups.setdefault((shape, fields), ([], []))
+        indices.append(i)
+        rows.append(values)
+    for (shape, fields), (indices, rows) in groups.items():
+        columns = np.array(rows, dtype=np.float64).T
+        batch = BATCH_SHAPES[shape][1](**dict(zip(fields, columns)))
+        with np.errstate(over="ignore", invalid="ignore"):
+            areas, perimeters = batch.area().tolist(), batch.perimeter().tolist()
+        for i, ok, area, perimeter in zip(indices, batch.valid.tolist(), areas, perimeters):
+            results[i] = (_checked_result(area, perimeter) if ok
+                          else (math.nan, math.nan, f"invalid {shape} dimensions"))
+    return results
+
+
+def _ndjson_line(rid, shape, area: float, perimeter: float, error: Optional[str]) -> str:
+    # formatted by hand: json.dumps per record costs more than computing the shapes
+    rid = str(rid) if type(rid) is int else _json_encode(rid)
+    shape = _json_encode(shape)
+    if error is not None:
+        return f'{{"id": {rid}, "shape": {shape}, "area": null, "perimeter": null, "error": {_json_encode(error)}}}\n'
+    return f'{{"id": {rid}, "shape": {shape}, "area": {area!r}, "perimeter": {perimeter!r}, "error": null}}\n'
+
+
+def batch_process(source: IO[str], out: IO[str], in_fmt: str = "ndjson", out_fmt: str = "ndjson",
+                  chunk_size: int = BATCH_CHUNK) -> Tuple[int, int]:
+    """Stream records from `source` to `out` in chunks; return (records, errors).
+
+    Only one chunk of records and results is held in memory at a time.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    records = read_shape_records(source, in_fmt)
+    writer = None
+    if out_fmt == "csv":
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow(BATCH_COLUMNS)
+    total = errors = 0
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            break
+        results = measure_records(chunk)
+        rows = [(record.get("id", n), record.get("shape"), area, perimeter, error)
+                for n, record, (area, perimeter, error) in zip(range(total, total + len(chunk)), chunk, results)]
+        errors += sum(error is not None for _, _, error in results)
+        total += len(chunk)
+        if writer is not None:
+            writer.writerows((rid, shape, "" if error else area, "" if error else perimeter, error or "")
+                             for rid, shape, area, perimeter, error in rows)
+        else:
+            out.write("".join([_ndjson_line(*row) for row in rows]))
+    return total, errors
+
+
+def _batch_main(args) -> int:
+    in_fmt = args.input_format or ("csv" if args.batch.lower().endswith(".csv") else "ndjson")
+    out_fmt = args.format or in_fmt
+    buffer = 1 << 20
+    source = sys.stdin if args.batch == "-" else open(args.batch, newline="", buffering=buffer)
+    out = sys.stdout if args.output in (None, "-") else open(args.output, "w", newline="", buffering=buffer)
+    try:
+        total, errors = batch_process(source, out, in_fmt, out_fmt, args.chunk_size)
+    except BrokenPipeError:  # e.g. piped into `head`
+        sys.stdout = open(os.devnull, "w")
+        return 0
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+    print(f"{total} records, {errors} errors", file=sys.stderr)
+    return 0
+
+
 # Utility helpers for CLI
 def _read_positive_number(prompt: str) -> float:
     while True:
@@ -178,6 +807,27 @@ def demo():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Polygon area calculator")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="Stream shape records from an NDJSON or .csv file ('-' for stdin)")
+    parser.add_argument("--input-format", choices=["ndjson", "csv"],
+                        help="Batch input format (default: csv for *.csv files, otherwise ndjson)")
+    parser.add_argument("--output", metavar="FILE", help="Write batch results here (default stdout)")
+    parser.add_argument("--format", choices=["ndjson", "csv"],
+                        help="Batch output format (default: same as the input)")
+    parser.add_argument("--chunk-size", type=int, default=BATCH_CHUNK,
+                        help="Records computed per vectorised chunk")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Time and size one million instances of each shape")
+    cli_args = parser.parse_args()
+    if cli_args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+    if cli_args.benchmark:
+        benchmark_instances()
+        sys.exit()
+    if cli_args.batch:
+        sys.exit(_batch_main(cli_args))
+
     # Small examples
     print("Examples:")
     print(Triangle(a=3, b=4, c=5))
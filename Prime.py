@@ -1,8 +1,6 @@
-from math import sqrt
+from primality import is_prime
 number = int(input("number to check prime :" ))
-for k in range(2, int(sqrt(number))+1):
-    if (number % k) ==0:
-        print(number, "is not a prime number")
-        break
+if is_prime(number):
+    print(number, "is a prime number")
 else:
-    print(number, "is a prime number")
\ No newline at end of file
+    print(number, "is not a prime number")
\ No newline at end of file
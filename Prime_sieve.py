@@ -1,17 +1,147 @@
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress, islice
+from math import isqrt
+
+# Odd-only segment length in bytes (one byte per odd number). 256 KiB keeps a
+# segment inside a typical L2 cache while it is being crossed off.
+SEGMENT_SIZE = 1 << 18
+
+
+def base_primes(limit):
+    """Odd primes up to limit with a plain odd-only sieve (O(sqrt n) when limit = sqrt n)."""
+    if limit < 3:
+        return []
+    # index i stands for 2*i + 1
+    sieve = bytearray([1]) * (limit // 2 + 1)
+    sieve[0] = 0
+    for i in range(1, (isqrt(limit) - 1) // 2 + 1):
+        if sieve[i]:
+            p = 2 * i + 1
+            start = p * p // 2
+            sieve[start::p] = bytes(len(range(start, len(sieve), p)))
+    return [2 * i + 1 for i in compress(range(len(sieve)), sieve) if 2 * i + 1 <= limit]
+
+
+def sieve_segment(lo, hi, primes):
+    """Sieve the odd numbers in [lo, hi) (lo odd) with the odd base primes.
+
+    Returns a bytearray whose byte i is 1 iff lo + 2*i is prime.
+    """
+    size = (hi - lo + 1) // 2
+    seg = bytearray([1]) * size
+    for p in primes:
+        if p * p >= hi:
+            break
+        start = max(p * p, (lo + p - 1) // p * p)
+        if start % 2 == 0:
+            start += p
+        idx = (start - lo) // 2
+        if idx < size:
+            seg[idx::p] = bytes(len(range(idx, size, p)))
+    if lo == 1:
+        seg[0] = 0
+    return seg
+
+
+def primes_up_to(num, segment_size=SEGMENT_SIZE):
+    """Lazily yield the primes <= num using a segmented, odd-only sieve.
+
+    Memory is O(sqrt(num)) for the base primes plus one segment.
+    """
+    if num < 2:
+        return
+    yield 2
+    primes = base_primes(isqrt(num))
+    span = 2 * segment_size
+    for lo in range(1, num + 1, span):
+        hi = min(lo + span, num + 1)
+        yield from compress(range(lo, hi, 2), sieve_segment(lo, hi, primes))
+
+
+# Ranges shorter than this many segments are sieved in-process.
+PARALLEL_MIN_SEGMENTS = 8
+
+_worker_primes = []
+
+
+def _init_worker(primes):
+    global _worker_primes
+    _worker_primes = primes
+
+
+def _count_segment(bounds):
+    return sieve_segment(bounds[0], bounds[1], _worker_primes).count(1)
+
+
+def _list_segment(bounds):
+    lo, hi = bounds
+    return list(compress(range(lo, hi, 2), sieve_segment(lo, hi, _worker_primes)))
+
+
+def _segments(lo, hi, segment_size):
+    """Split the odd numbers of [lo, hi) into (start, stop) pairs with odd starts."""
+    start = max(lo, 1) | 1
+    span = 2 * segment_size
+    return [(a, min(a + span, hi)) for a in range(start, hi, span)]
+
+
+def _map_segments(func, segments, primes, workers):
+    """Yield func(segment) in order, on a process pool when the range is large enough.
+
+    At most a few tasks per worker are in flight, so results do not pile up.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(segments) < PARALLEL_MIN_SEGMENTS:
+        _init_worker(primes)
+        yield from map(func, segments)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(primes,)) as pool:
+        pending = deque()
+        todo = iter(segments)
+        for bounds in islice(todo, 4 * workers):
+            pending.append(pool.submit(func, bounds))
+        while pending:
+            result = pending.popleft().result()
+            for bounds in islice(todo, 1):
+                pending.append(pool.submit(func, bounds))
+            yield result
+
+
+def primes_in_range(lo, hi, workers=None, segment_size=SEGMENT_SIZE):
+    """Yield the primes p with lo <= p < hi, in order, sieving segments in parallel."""
+    if hi <= 2 or hi <= lo:
+        return
+    if lo <= 2:
+        yield 2
+    primes = base_primes(isqrt(hi - 1))
+    for chunk in _map_segments(_list_segment, _segments(lo, hi, segment_size), primes, workers):
+        yield from chunk
+
+
+def count_primes(n, workers=None, segment_size=SEGMENT_SIZE):
+    """Return the number of primes <= n, counting segments on a process pool."""
+    if n < 2:
+        return 0
+    primes = base_primes(isqrt(n))
+    return 1 + sum(_map_segments(_count_segment, _segments(1, n + 1, segment_size), primes, workers))
+
+
 def SieveOfEratosthenes(num):
-    prime = [True for i in range(num+1)]
-    p = 2
-    while (p * p <= num):
-        if (prime[p] == True):
-            for i in range(p * p, num+1, p):
-                prime[i] = False
-        p += 1
-
-    for p in range(2, num+1):
-        if prime[p]:
-            print(p)
-
-num = int(input())
-print("Following are the prime numbers smaller")
-print("than or equal to", num)
-SieveOfEratosthenes(num)
\ No newline at end of file
+    primes = primes_up_to(num)
+    # write in blocks instead of one print() per prime
+    while True:
+        block = list(islice(primes, 65536))
+        if not block:
+            break
+        sys.stdout.write("\n".join(map(str, block)) + "\n")
+
+
+if __name__ == "__main__":
+    num = int(input())
+    print("Following are the prime numbers smaller")
+    print("than or equal to", num)
+    SieveOfEratosthenes(num)
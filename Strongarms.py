@@ -1,13 +1,8 @@
+from Armstrong import is_armstrong
+
 number = int(input("Input your number: "))
-digits = len(str(number))
-resultNumber = 0
-temp = number
-while temp > 0:
-    digit = temp % 10
-    resultNumber += digit ** digits
-    temp //= 10
 
-if number == resultNumber:
+if is_armstrong(number):
     print(number, "is an Armstrong number")
 else:
     print(number, "is not an Armstrong number")
\ No newline at end of file
@@ -1,11 +1,13 @@
 # To find factors of user input
+from factorization import divisors
  
-# Goes from 1 to number and checks if I divide the number. If yes, it is a factor
+# Factorises the number (trial division + Pollard's rho) and builds every factor from the primes
 def print_factors(number):
    print("The factors of",number,"are:")
-   for i in range(1, number + 1):
-       if number % i == 0:
-           print(i)
+   if number < 1:
+       return
+   for i in divisors(number):
+       print(i)
  
 # Taking input from the user
 number = int(input("Enter your number to find it's factors: "))
@@ -0,0 +1,100 @@
+"""factorization.py
+
+Integer factorisation used by "That's a fact.py".
+
+n is first trial-divided by the primes below TRIAL_LIMIT. Whatever is left is
+split with Pollard's rho (Brent's variant) until every part passes
+`primality.is_prime`. Factorisations are memoised in an LRU cache.
+
+Functions provided:
+    - factorize(n): {prime: exponent} for n >= 1
+    - divisors(n): generator of all divisors of n in increasing order
+"""
+
+import heapq
+import random
+from functools import lru_cache
+from math import gcd
+from typing import Dict, Iterator, Tuple
+
+from Prime_sieve import primes_up_to
+from primality import is_prime
+
+TRIAL_LIMIT = 10_000
+_TRIAL_PRIMES = tuple(primes_up_to(TRIAL_LIMIT))
+
+
+def pollard_brent(n: int) -> int:
+    """Return a non-trivial factor of the odd composite n (Brent's cycle detection)."""
+    rng = random.Random(n)  # deterministic per n
+    while True:
+        y, c, m = rng.randrange(1, n), rng.randrange(1, n), 128
+        g = r = q = 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = gcd(q, n)
+                k += m
+            r *= 2
+        if g == n:
+            # the batched gcd overshot; step back one at a time
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = gcd(abs(x - ys), n)
+        if g != n:
+            return g
+
+
+@lru_cache(maxsize=4096)
+def _factorize(n: int) -> Tuple[Tuple[int, int], ...]:
+    factors: Dict[int, int] = {}
+    for p in _TRIAL_PRIMES:
+        if p * p > n:
+            break
+        while n % p == 0:
+            factors[p] = factors.get(p, 0) + 1
+            n //= p
+    stack = [n] if n > 1 else []
+    while stack:
+        m = stack.pop()
+        if is_prime(m):
+            factors[m] = factors.get(m, 0) + 1
+            continue
+        d = pollard_brent(m)
+        stack.extend((d, m // d))
+    return tuple(sorted(factors.items()))
+
+
+def factorize(n: int) -> Dict[int, int]:
+    """Return the prime factorisation of n as {prime: exponent} (empty for 1)."""
+    if n < 1:
+        raise ValueError("n must be a positive integer")
+    return dict(_factorize(n))
+
+
+def divisors(n: int) -> Iterator[int]:
+    """Yield every divisor of n in increasing order, built from its factorisation.
+
+    A heap holds the frontier of exponent vectors. Each divisor is pushed once,
+    from the divisor with the same exponents except its last non-zero one
+    lowered by 1.
+    """
+    if n < 1:
+        raise ValueError("n must be a positive integer")
+    primes, max_exps = zip(*_factorize(n)) if n > 1 else ((), ())
+    heap = [(1, 0, (0,) * len(primes))]
+    while heap:
+        d, last, exps = heapq.heappop(heap)
+        yield d
+        for i in range(last, len(primes)):
+            if exps[i] < max_exps[i]:
+                child = exps[:i] + (exps[i] + 1,) + exps[i + 1:]
+                heapq.heappush(heap, (d * primes[i], i, child))
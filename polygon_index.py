@@ -0,0 +1,186 @@
+"""polygon_index.py
+
+Spatial index over the bounding boxes of shapes from `Polygon.py`.
+
+STRTree is a static R-tree bulk-loaded with Sort-Tile-Recursive packing:
+boxes are sorted by centre x, cut into vertical slices, sorted by centre y
+inside each slice and grouped into full nodes, level by level, up to a single
+root. Queries then only visit nodes whose boxes can contain an answer.
+
+Functions/classes provided:
+    - STRTree(items, boxes=None, node_capacity=16)
+        .query_bbox(min_x, min_y, max_x, max_y): items whose box intersects the window
+        .query_point(x, y): items containing the point (exact when an item has contains())
+        .nearest_k(x, y, k): the k items with the closest boxes, nearest first
+    - STRTree.from_packed(packed): index a Polygon.PackedPolygons without
+      building a VertexPolygon per polygon
+    - benchmark(n, queries): compare the tree against a brute-force scan
+"""
+
+import heapq
+import math
+import random
+import time
+from typing import Any, List, Optional, Sequence, Tuple
+
+Box = Tuple[float, float, float, float]
+
+
+def _union(entries) -> Box:
+    return (min(e[0] for e in entries), min(e[1] for e in entries),
+            max(e[2] for e in entries), max(e[3] for e in entries))
+
+
+def _str_pack(entries: list, capacity: int) -> list:
+    """Group (min_x, min_y, max_x, max_y, payload) entries into parent entries."""
+    n_nodes = math.ceil(len(entries) / capacity)
+    per_slice = capacity * math.ceil(math.sqrt(n_nodes))
+    entries.sort(key=lambda e: e[0] + e[2])
+    parents = []
+    for s in range(0, len(entries), per_slice):
+        tile = sorted(entries[s:s + per_slice], key=lambda e: e[1] + e[3])
+        for g in range(0, len(tile), capacity):
+            group = tile[g:g + capacity]
+            parents.append(_union(group) + (group,))
+    return parents
+
+
+def _box_distance(box, x: float, y: float) -> float:
+    dx = max(box[0] - x, 0.0, x - box[2])
+    dy = max(box[1] - y, 0.0, y - box[3])
+    return math.hypot(dx, dy)
+
+
+class STRTree:
+    """Static, bulk-loaded R-tree over the bounding boxes of `items`.
+
+    `boxes` defaults to `item.bbox()` for every item. The tree does not change
+    after construction; build a new one when the collection changes.
+    """
+
+    def __init__(self, items: Sequence[Any], boxes: Optional[Sequence[Box]] = None,
+                 node_capacity: int = 16):
+        if node_capacity < 2:
+            raise ValueError("node_capacity must be at least 2")
+        self.items = items if hasattr(items, "__getitem__") else list(items)
+        if boxes is None:
+            boxes = [item.bbox() for item in self.items]
+        if len(boxes) != len(self.items):
+            raise ValueError("Need exactly one box per item")
+        # leaf entries carry the item index; every level above carries its children
+        level = [tuple(map(float, box)) + (i,) for i, box in enumerate(boxes)]
+        self.height = 0
+        while len(level) > node_capacity:
+            level = _str_pack(level, node_capacity)
+            self.height += 1
+        self._root = level
+
+    @classmethod
+    def from_packed(cls, packed, node_capacity: int = 16) -> "STRTree":
+        """Index a PackedPolygons; results are zero-copy VertexPolygon views."""
+        boxes = packed.bboxes().tolist() if len(packed) else []
+        return cls(packed, boxes, node_capacity)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def _search(self, min_x: float, min_y: float, max_x: float, max_y: float) -> List[int]:
+        found = []
+        stack = [(self._root, self.height)]
+        while stack:
+            entries, depth = stack.pop()
+            for e in entries:
+                if e[0] <= max_x and e[2] >= min_x and e[1] <= max_y and e[3] >= min_y:
+                    if depth:
+                        stack.append((e[4], depth - 1))
+                    else:
+                        found.append(e[4])
+        found.sort()
+        return found
+
+    def query_bbox(self, min_x: float, min_y: float, max_x: float, max_y: float) -> list:
+        """Return the items whose bounding box intersects the window (edges included)."""
+        return [self.items[i] for i in self._search(min_x, min_y, max_x, max_y)]
+
+    def query_point(self, x: float, y: float) -> list:
+        """Return the items containing (x, y).
+
+        Candidates come from the box search; items with a `contains(x, y)`
+        method are then tested exactly.
+        """
+        result = []
+        for i in self._search(x, y, x, y):
+            item = self.items[i]
+            contains = getattr(item, "contains", None)
+            if contains is None or contains(x, y):
+                result.append(item)
+        return result
+
+    def nearest_k(self, x: float, y: float, k: int = 1) -> List[Tuple[float, Any]]:
+        """Return up to k (distance, item) pairs ordered by distance to the item's box.
+
+        Best-first search: nodes and items share one heap keyed by box distance,
+        so an item popped from the heap is never farther than anything unseen.
+        """
+        if k <= 0:
+            return []
+        heap = [(_box_distance(e, x, y), self.height, n, e[4]) for n, e in enumerate(self._root)]
+        heapq.heapify(heap)
+        counter = len(heap)  # tie-breaker so payloads are never compared
+        result = []
+        while heap and len(result) < k:
+            dist, depth, _, payload = heapq.heappop(heap)
+            if depth == 0:
+                result.append((dist, self.items[payload]))
+                continue
+            for e in payload:
+                heapq.heappush(heap, (_box_distance(e, x, y), depth - 1, counter, e[4]))
+                counter += 1
+        return result
+
+
+def _random_boxes(n: int, rng: random.Random, world: float = 10_000.0, size: float = 20.0) -> List[Box]:
+    boxes = []
+    for _ in range(n):
+        x, y = rng.uniform(0, world), rng.uniform(0, world)
+        boxes.append((x, y, x + rng.uniform(1, size), y + rng.uniform(1, size)))
+    return boxes
+
+
+def benchmark(n: int = 100_000, queries: int = 200, seed: int = 0) -> None:
+    """Time window and nearest-neighbour queries against a linear scan of the boxes."""
+    rng = random.Random(seed)
+    boxes = _random_boxes(n, rng)
+    start = time.perf_counter()
+    tree = STRTree(range(n), boxes)
+    build = time.perf_counter() - start
+    windows = [(x, y, x + 100, y + 100) for _, _, x, y in _random_boxes(queries, rng)]
+    points = [(w[0], w[1]) for w in windows]
+
+    start = time.perf_counter()
+    tree_hits = [tree.query_bbox(*w) for w in windows]
+    tree_bbox = time.perf_counter() - start
+    start = time.perf_counter()
+    brute_hits = [[i for i, b in enumerate(boxes)
+                   if b[0] <= w[2] and b[2] >= w[0] and b[1] <= w[3] and b[3] >= w[1]]
+                  for w in windows]
+    brute_bbox = time.perf_counter() - start
+    assert tree_hits == brute_hits, "query_bbox disagrees with brute force"
+
+    start = time.perf_counter()
+    tree_nn = [tree.nearest_k(px, py, 10) for px, py in points]
+    tree_knn = time.perf_counter() - start
+    start = time.perf_counter()
+    brute_nn = [heapq.nsmallest(10, (_box_distance(b, px, py) for b in boxes)) for px, py in points]
+    brute_knn = time.perf_counter() - start
+    assert [[d for d, _ in r] for r in tree_nn] == brute_nn, "nearest_k disagrees with brute force"
+
+    print(f"{n} boxes, {queries} queries; STR build {build:.3f}s (height {tree.height})")
+    print(f"query_bbox : tree {tree_bbox:.3f}s  brute force {brute_bbox:.3f}s  "
+          f"({brute_bbox / tree_bbox:.0f}x)")
+    print(f"nearest_k  : tree {tree_knn:.3f}s  brute force {brute_knn:.3f}s  "
+          f"({brute_knn / tree_knn:.0f}x)")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,150 @@
+"""primality.py
+
+Fast primality testing shared by `Prime.py` and `2digitPrimes.py`.
+
+- Numbers below SMALL_LIMIT are looked up in a precomputed odd-only sieve
+  bitmap (built once, on first use).
+- Larger numbers below 3.3 * 10**24 use Miller-Rabin with the first 13 prime
+  bases, which is deterministic in that range.
+- Anything larger uses the Baillie-PSW test (Miller-Rabin base 2 plus a
+  strong Lucas test), which has no known counterexample.
+
+Functions provided:
+    - is_prime(n): True if n is prime
+    - is_prime_many(numbers): list of is_prime results, sieving once for
+      large batches of moderately sized numbers
+"""
+
+from math import isqrt
+from typing import Iterable, List
+
+from Prime_sieve import base_primes, sieve_segment
+
+SMALL_LIMIT = 1 << 20
+# is_prime_many sieves up to the batch maximum when it is at most this
+BATCH_SIEVE_LIMIT = 1 << 25
+
+_MR_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+_MR_DETERMINISTIC_LIMIT = 3317044064679887385961981
+_TRIAL_PRIMES = _MR_BASES + (43, 47, 53, 59, 61, 67, 71, 73, 79, 83, 89, 97)
+
+_small_bitmap = None
+
+
+def _odd_bitmap(limit: int) -> bytearray:
+    """Byte i is 1 iff 2*i + 1 is prime, for 2*i + 1 < limit."""
+    return sieve_segment(1, limit, base_primes(isqrt(limit)))
+
+
+def _lookup(bitmap: bytearray, n: int) -> bool:
+    return n == 2 or (n & 1 == 1 and bitmap[n >> 1] == 1)
+
+
+def _miller_rabin(n: int, bases) -> bool:
+    d = n - 1
+    s = (d & -d).bit_length() - 1
+    d >>= s
+    for a in bases:
+        a %= n
+        if a == 0:
+            continue
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _jacobi(a: int, n: int) -> int:
+    a %= n
+    result = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+
+def _strong_lucas(n: int) -> bool:
+    """Strong Lucas probable-prime test with Selfridge's parameters (n odd, not a square)."""
+    D = 5
+    while True:
+        j = _jacobi(D, n)
+        if j == -1:
+            break
+        if j == 0 and abs(D) != n:
+            return False
+        D = -D - 2 if D > 0 else -D + 2
+    P, Q = 1, (1 - D) // 4
+
+    d, s = n + 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    def half(x):
+        x %= n
+        return (x + n if x & 1 else x) // 2
+
+    U, V, Qk = 1, P, Q % n
+    for bit in bin(d)[3:]:
+        U, V, Qk = U * V % n, (V * V - 2 * Qk) % n, Qk * Qk % n
+        if bit == "1":
+            U, V, Qk = half(P * U + V), half(D * U + P * V), Qk * Q % n
+    if U == 0 or V == 0:
+        return True
+    for _ in range(s - 1):
+        V, Qk = (V * V - 2 * Qk) % n, Qk * Qk % n
+        if V == 0:
+            return True
+    return False
+
+
+def _is_prime_large(n: int) -> bool:
+    for p in _TRIAL_PRIMES:
+        if n % p == 0:
+            return n == p
+    if n < _MR_DETERMINISTIC_LIMIT:
+        return _miller_rabin(n, _MR_BASES)
+    r = isqrt(n)
+    if r * r == n:
+        return False
+    return _miller_rabin(n, (2,)) and _strong_lucas(n)
+
+
+def is_prime(n: int) -> bool:
+    """Return True if n is prime (False for n < 2)."""
+    global _small_bitmap
+    if n < 2:
+        return False
+    if n < SMALL_LIMIT:
+        if _small_bitmap is None:
+            _small_bitmap = _odd_bitmap(SMALL_LIMIT)
+        return _lookup(_small_bitmap, n)
+    return _is_prime_large(n)
+
+
+def is_prime_many(numbers: Iterable[int]) -> List[bool]:
+    """Return [is_prime(n) for n in numbers].
+
+    When a large batch only holds numbers up to BATCH_SIEVE_LIMIT, one sieve
+    up to the batch maximum answers every number with a table lookup.
+    """
+    values = list(numbers)
+    if not values:
+        return []
+    top = max(values)
+    if SMALL_LIMIT <= top <= BATCH_SIEVE_LIMIT and len(values) > top // 1024:
+        bitmap = _odd_bitmap(top + 1)
+        return [n >= 2 and _lookup(bitmap, n) for n in values]
+    return [is_prime(n) for n in values]
@@ -8,16 +8,44 @@ Features:
 - Maintain a `students.json` index file
 - Read/list existing records
 
+The index is kept by `StudentIndex`, a small log-structured store: every
+update is appended to `students.log` (one JSON record per line) and the log
+is periodically compacted into the `students.json` snapshot. On open the
+in-memory index is rebuilt from snapshot plus log, so saving a student costs
+one appended line instead of rewriting the whole index.
+
 Usage examples included in the `__main__` block.
 """
 
 import os
 import json
+import asyncio
+import hashlib
 from dataclasses import dataclass
-from typing import Optional
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
 
 STUDENTS_DIR = os.path.join(os.path.dirname(__file__), "students_records")
 JSON_INDEX = os.path.join(STUDENTS_DIR, "students.json")
+INDEX_LOG = os.path.join(STUDENTS_DIR, "students.log")
+MANIFEST = os.path.join(STUDENTS_DIR, "students.manifest.json")
+SQLITE_DB = os.path.join(STUDENTS_DIR, "students.db")
+# each backend remembers which files it has indexed in its own manifest
+SQLITE_MANIFEST = os.path.join(STUDENTS_DIR, "students.db.manifest.json")
+
+# Record files live in hashed fan-out directories: SHARD_LEVELS levels of
+# SHARD_WIDTH hex characters taken from sha1(sanitized name).
+SHARD_LEVELS = 2
+SHARD_WIDTH = 2
+
+# "json" (students.json + students.log) or "sqlite" (students.db)
+INDEX_BACKEND = os.environ.get("STUDENTS_BACKEND", "json")
+
+# Compact once the log holds at least this many records *and* at least as many
+# records as the snapshot; this keeps total bytes written linear in updates.
+COMPACT_MIN_RECORDS = 1000
+
+# Below this many files to parse, a process pool costs more than it saves.
+PARALLEL_PARSE_THRESHOLD = 2000
 
 @dataclass
 class Student:
@@ -37,18 +65,35 @@ def sanitize_filename(name: str) -> str:
     return safe.replace(" ", "_")
 
 
+def _shard_relpath(safe_name: str) -> str:
+    digest = hashlib.sha1(safe_name.encode("utf-8")).hexdigest()
+    parts = [digest[i * SHARD_WIDTH:(i + 1) * SHARD_WIDTH] for i in range(SHARD_LEVELS)]
+    return os.path.join(*parts, safe_name + ".txt")
+
+
+def _shard_path(safe_name: str) -> str:
+    return os.path.join(STUDENTS_DIR, _shard_relpath(safe_name))
+
+
 def student_file_path(name: str) -> str:
+    """Path of a student's file in the sharded layout, e.g. `students_records/3f/a2/Roy.txt`."""
+    return _shard_path(sanitize_filename(name))
+
+
+def legacy_student_file_path(name: str) -> str:
+    """Path of a student's file in the old flat layout (`students_records/Roy.txt`)."""
     fname = sanitize_filename(name) + ".txt"
     return os.path.join(STUDENTS_DIR, fname)
 
 
-def save_student_file(student: Student, overwrite: bool = True) -> str:
-    """Write a per-student text file. Returns path."""
-    ensure_dir()
-    path = student_file_path(student.name)
-    if os.path.exists(path) and not overwrite:
-        raise FileExistsError(f"File {path} exists and overwrite is False")
+def _remove_legacy_file(name: str):
+    try:
+        os.remove(legacy_student_file_path(name))
+    except FileNotFoundError:
+        pass
 
+
+def format_student_file(student: Student) -> str:
     content_lines = [
         f"Name: {student.name}",
         f"Class: {student.student_class}",
@@ -57,8 +102,28 @@ def save_student_file(student: Student, overwrite: bool = True) -> str:
         "Brief intro:",
         student.intro or "",
     ]
+    return "\n".join(content_lines)
+
+
+def write_student_file(student: Student, overwrite: bool = True) -> str:
+    """Write only the per-student text file (no index update). Returns path."""
+    ensure_dir()
+    path = student_file_path(student.name)
+    if not overwrite:
+        for existing in (path, legacy_student_file_path(student.name)):
+            if os.path.exists(existing):
+                raise FileExistsError(f"File {existing} exists and overwrite is False")
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
     with open(path, "w", encoding="utf-8") as fh:
-        fh.write("\n".join(content_lines))
+        fh.write(format_student_file(student))
+    _remove_legacy_file(student.name)
+    return path
+
+
+def save_student_file(student: Student, overwrite: bool = True) -> str:
+    """Write a per-student text file. Returns path."""
+    path = write_student_file(student, overwrite=overwrite)
 
     # update index json
     update_index(student)
@@ -67,83 +132,636 @@ def save_student_file(student: Student, overwrite: bool = True) -> str:
 
 def read_student_file(name: str) -> str:
     path = student_file_path(name)
-    with open(path, "r", encoding="utf-8") as fh:
+    try:
+        fh = open(path, "r", encoding="utf-8")
+    except FileNotFoundError:
+        # not migrated yet: fall back to the flat layout
+        fh = open(legacy_student_file_path(name), "r", encoding="utf-8")
+    with fh:
         return fh.read()
 
 
-def update_index(student: Student):
-    ensure_dir()
-    index = {}
-    if os.path.exists(JSON_INDEX):
-        with open(JSON_INDEX, "r", encoding="utf-8") as fh:
-            try:
-                index = json.load(fh)
-            except json.JSONDecodeError:
-                index = {}
-    index[student.name] = {
+def index_entry(student: Student) -> dict:
+    return {
         "class": student.student_class,
         "favourite_subject": student.favourite_subject,
         "intro_preview": (student.intro or "").strip()[:120],
     }
-    with open(JSON_INDEX, "w", encoding="utf-8") as fh:
-        json.dump(index, fh, indent=2, ensure_ascii=False)
+
+
+class StudentIndex:
+    """Append-only index store: `students.json` snapshot plus `students.log` write-ahead log.
+
+    Each log line is a JSON object `{"op": "put"|"del", "name": ..., "value": ...}`.
+    Replaying the log over the snapshot is idempotent, so a crash at any point
+    (including mid-compaction) loses at most a partially written last line.
+    """
+
+    def __init__(self, snapshot_path: str, log_path: str,
+                 compact_min_records: int = COMPACT_MIN_RECORDS, durable: bool = False):
+        self.snapshot_path = snapshot_path
+        self.log_path = log_path
+        self.compact_min_records = compact_min_records
+        self.durable = durable
+        self.entries: Dict[str, dict] = {}
+        self.log_records = 0
+        self.snapshot_records = 0  # records in the snapshot as of the last compaction
+        self._log_fh = None
+        self._load()
+
+    def _load(self):
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "r", encoding="utf-8") as fh:
+                try:
+                    self.entries = json.load(fh)
+                except json.JSONDecodeError:
+                    self.entries = {}
+            self.snapshot_records = len(self.entries)
+        if os.path.exists(self.log_path):
+            valid_bytes = 0
+            with open(self.log_path, "rb") as fh:
+                for raw in fh:
+                    if not raw.endswith(b"\n"):
+                        # torn write from a crash: discard the partial last line
+                        break
+                    try:
+                        record = json.loads(raw)
+                    except ValueError:
+                        break
+                    self._apply(record)
+                    self.log_records += len(record["values"]) if record.get("op") == "batch" else 1
+                    valid_bytes += len(raw)
+            if valid_bytes != os.path.getsize(self.log_path):
+                with open(self.log_path, "r+b") as fh:
+                    fh.truncate(valid_bytes)
+
+    def _apply(self, record: dict):
+        op = record.get("op")
+        if op == "del":
+            self.entries.pop(record["name"], None)
+        elif op == "batch":
+            self.entries.update(record["values"])
+        else:
+            self.entries[record["name"]] = record["value"]
+
+    def _append(self, record: dict):
+        if self._log_fh is None:
+            os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+            self._log_fh = open(self.log_path, "a", encoding="utf-8")
+        self._log_fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._log_fh.flush()
+        if self.durable:
+            os.fsync(self._log_fh.fileno())
+        self._apply(record)
+        self.log_records += len(record["values"]) if record["op"] == "batch" else 1
+        if self.log_records >= max(self.compact_min_records, self.snapshot_records):
+            self.compact()
+
+    def put(self, name: str, value: dict):
+        self._append({"op": "put", "name": name, "value": value})
+
+    def put_many(self, values: Dict[str, dict]):
+        """Commit several entries as one log line, so the batch is applied all-or-nothing."""
+        if values:
+            self._append({"op": "batch", "values": values})
+
+    def delete(self, name: str):
+        if name in self.entries:
+            self._append({"op": "del", "name": name})
+
+    def replace_all(self, entries: Dict[str, dict]):
+        """Replace the whole index with `entries` and write a fresh snapshot."""
+        self.entries = dict(entries)
+        self.compact()
+
+    def merge_snapshot(self, values: Dict[str, dict]):
+        """Merge `values` and commit them straight into a fresh snapshot (no log record)."""
+        self.entries.update(values)
+        self.compact()
+
+    def as_dict(self) -> Dict[str, dict]:
+        return dict(self.entries)
+
+    def iter_entries(self, offset: int = 0, limit: Optional[int] = None,
+                     cursor: Optional[str] = None) -> Iterator[Tuple[str, dict]]:
+        """Yield `(name, entry)` in index order, starting after the record named `cursor`."""
+        from itertools import dropwhile, islice
+        items = iter(self.entries.items())
+        if cursor is not None:
+            items = dropwhile(lambda item: item[0] != cursor, items)
+            next(items, None)
+        stop = None if limit is None else offset + limit
+        return islice(items, offset, stop)
+
+    def query(self, class_: Optional[int] = None, subject: Optional[str] = None,
+              prefix: Optional[str] = None) -> Dict[str, dict]:
+        """Filter by class, favourite subject and/or name prefix (full scan)."""
+        return {
+            name: e for name, e in self.entries.items()
+            if (class_ is None or e.get("class") == class_)
+            and (subject is None or e.get("favourite_subject") == subject)
+            and (prefix is None or name.startswith(prefix))
+        }
+
+    def compact(self):
+        """Write the in-memory index to the snapshot atomically, then truncate the log."""
+        os.makedirs(os.path.dirname(self.snapshot_path), exist_ok=True)
+        tmp = self.snapshot_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(self.entries, fh, indent=2, ensure_ascii=False)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, self.snapshot_path)
+        if self._log_fh is not None:
+            self._log_fh.close()
+            self._log_fh = None
+        # Truncating only after the snapshot is in place keeps replay idempotent.
+        open(self.log_path, "w", encoding="utf-8").close()
+        self.log_records = 0
+        self.snapshot_records = len(self.entries)
+
+    def close(self):
+        if self._log_fh is not None:
+            self._log_fh.close()
+            self._log_fh = None
+
+
+class SQLiteStudentIndex:
+    """SQLite-backed index with the same interface as StudentIndex.
+
+    Uses WAL mode and secondary indexes on class and favourite_subject, so
+    `query` does not need to load the whole roster.
+    """
+
+    def __init__(self, db_path: str):
+        import sqlite3
+        self.db_path = db_path
+        # callers serialise access themselves (see AsyncStudentService), so the
+        # connection may be used from a worker thread
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS students ("
+                " name TEXT PRIMARY KEY,"
+                " class INTEGER,"
+                " favourite_subject TEXT,"
+                " intro_preview TEXT)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_students_class ON students(class)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_students_subject ON students(favourite_subject)")
+
+    @staticmethod
+    def _row(name: str, value: dict) -> tuple:
+        return (name, value.get("class"), value.get("favourite_subject"), value.get("intro_preview"))
+
+    @staticmethod
+    def _entry(row: tuple) -> dict:
+        return {"class": row[1], "favourite_subject": row[2], "intro_preview": row[3]}
+
+    def put(self, name: str, value: dict):
+        self.put_many({name: value})
+
+    def put_many(self, values: Dict[str, dict]):
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO students VALUES (?, ?, ?, ?)",
+                                  [self._row(n, v) for n, v in values.items()])
+
+    merge_snapshot = put_many
+
+    def delete(self, name: str):
+        with self.conn:
+            self.conn.execute("DELETE FROM students WHERE name = ?", (name,))
+
+    def replace_all(self, entries: Dict[str, dict]):
+        with self.conn:
+            self.conn.execute("DELETE FROM students")
+            self.conn.executemany("INSERT OR REPLACE INTO students VALUES (?, ?, ?, ?)",
+                                  [self._row(n, v) for n, v in entries.items()])
+
+    def compact(self):
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self):
+        self.conn.close()
+
+    def as_dict(self) -> Dict[str, dict]:
+        return self.query()
+
+    def iter_entries(self, offset: int = 0, limit: Optional[int] = None,
+                     cursor: Optional[str] = None) -> Iterator[Tuple[str, dict]]:
+        """Yield `(name, entry)` ordered by name, starting after `cursor` (keyset pagination)."""
+        sql = "SELECT name, class, favourite_subject, intro_preview FROM students"
+        params: list = []
+        if cursor is not None:
+            sql += " WHERE name > ?"
+            params.append(cursor)
+        sql += " ORDER BY name LIMIT ? OFFSET ?"
+        params.extend([-1 if limit is None else limit, offset])
+        # a fresh cursor per call, so concurrent listings do not share row state
+        for row in self.conn.cursor().execute(sql, params):
+            yield row[0], self._entry(row)
+
+    def query(self, class_: Optional[int] = None, subject: Optional[str] = None,
+              prefix: Optional[str] = None) -> Dict[str, dict]:
+        """Filter by class, favourite subject and/or name prefix using the table indexes."""
+        clauses, params = [], []
+        if class_ is not None:
+            clauses.append("class = ?")
+            params.append(class_)
+        if subject is not None:
+            clauses.append("favourite_subject = ?")
+            params.append(subject)
+        if prefix:
+            # a range on the primary key instead of LIKE, so the index is used
+            clauses.append("name >= ? AND name < ?")
+            params.extend([prefix, prefix + "\U0010ffff"])
+        sql = "SELECT name, class, favourite_subject, intro_preview FROM students"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY name"
+        return {row[0]: self._entry(row) for row in self.conn.execute(sql, params)}
+
+
+_index = None
+_index_path: Optional[str] = None
+
+
+def get_index():
+    """Return the process-wide index for INDEX_BACKEND, opening it on first use."""
+    global _index, _index_path
+    path = SQLITE_DB if INDEX_BACKEND == "sqlite" else JSON_INDEX
+    if _index is None or _index_path != path:
+        ensure_dir()
+        if _index is not None:
+            _index.close()
+        _index = SQLiteStudentIndex(path) if INDEX_BACKEND == "sqlite" else StudentIndex(path, INDEX_LOG)
+        _index_path = path
+    return _index
+
+
+def update_index(student: Student):
+    get_index().put(student.name, index_entry(student))
+
+
+def compact_index():
+    get_index().compact()
 
 
 def list_students() -> dict:
+    return get_index().as_dict()
+
+
+def iter_students(offset: int = 0, limit: Optional[int] = None,
+                  cursor: Optional[str] = None) -> Iterator[Tuple[str, dict]]:
+    """Lazily yield `(name, entry)` pairs; pass the last name seen as `cursor` to get the next page."""
+    return get_index().iter_entries(offset=offset, limit=limit, cursor=cursor)
+
+
+def write_students(records: Iterable[Tuple[str, dict]], out: TextIO, fmt: str = 'json',
+                   page_size: int = 50) -> Optional[str]:
+    """Stream records to `out` one at a time as `json` (one object), `ndjson` or a paged `table`.
+
+    Returns the name of the last record written, for use as the next `cursor`.
+    """
+    last = None
+    if fmt == 'json':
+        out.write('{')
+    for i, (name, entry) in enumerate(records):
+        if fmt == 'ndjson':
+            out.write(json.dumps({'name': name, **entry}, ensure_ascii=False) + '\n')
+        elif fmt == 'table':
+            if i % page_size == 0:
+                if i:
+                    out.write('\n')
+                out.write(f"{'Name':<24} {'Class':>5}  {'Favourite subject':<20} Intro\n")
+                out.write('-' * 80 + '\n')
+            intro = (entry.get('intro_preview') or '').replace('\n', ' ')[:40]
+            out.write(f"{name:<24} {entry.get('class')!s:>5}  {entry.get('favourite_subject') or '':<20} {intro}\n")
+        else:
+            body = json.dumps(entry, indent=2, ensure_ascii=False).replace('\n', '\n  ')
+            out.write(f"{',' if i else ''}\n  {json.dumps(name, ensure_ascii=False)}: {body}")
+        last = name
+    if fmt == 'json':
+        out.write('\n}\n' if last is not None else '}\n')
+    return last
+
+
+def query_students(class_: Optional[int] = None, subject: Optional[str] = None,
+                   prefix: Optional[str] = None) -> dict:
+    """Return students matching all given filters (class, favourite subject, name prefix)."""
+    return get_index().query(class_=class_, subject=subject, prefix=prefix)
+
+
+def migrate_to_sqlite() -> int:
+    """One-shot copy of the JSON/.txt layout into `students.db`.
+
+    Uses the JSON index (snapshot + log) when present, otherwise parses the
+    per-student .txt files. Returns the number of records migrated.
+    """
     ensure_dir()
-    if not os.path.exists(JSON_INDEX):
-        return {}
-    with open(JSON_INDEX, "r", encoding="utf-8") as fh:
-        return json.load(fh)
+    entries = StudentIndex(JSON_INDEX, INDEX_LOG).as_dict()
+    if not entries:
+        paths = [entry.path for entry in iter_record_files()]
+        entries = dict(r for r in _parse_many(paths) if r)
+    store = SQLiteStudentIndex(SQLITE_DB)
+    try:
+        store.replace_all(entries)
+    finally:
+        store.close()
+    return len(entries)
+
+
+def parse_student_file(path: str) -> Optional[Tuple[str, dict]]:
+    """Parse a per-student .txt file into `(name, index entry)`, or None if unreadable/unnamed."""
+    try:
+        with open(path, 'r', encoding='utf-8') as fh:
+            content = fh.read()
+    except OSError:
+        return None
+    lines = content.splitlines()
+    name = None
+    class_num = 8
+    fav = None
+    intro_lines = []
+    in_intro = False
+    for line in lines:
+        if line.startswith('Name:'):
+            name = line.split(':', 1)[1].strip()
+        elif line.startswith('Class:'):
+            try:
+                class_num = int(line.split(':', 1)[1].strip())
+            except Exception:
+                class_num = 8
+        elif line.startswith('Favourite subject:') or line.startswith('Favorite subject:'):
+            fav = line.split(':', 1)[1].strip()
+        elif line.strip() == 'Brief intro:':
+            in_intro = True
+        elif in_intro:
+            intro_lines.append(line)
+    if not name:
+        return None
+    intro = '\n'.join(intro_lines).strip()
+    return name, {
+        'class': class_num,
+        'favourite_subject': fav or None,
+        'intro_preview': (intro or '')[:120]
+    }
 
 
-def rebuild_index_from_files() -> int:
+def iter_record_files(include_shards: bool = True, _dir: Optional[str] = None,
+                      _depth: int = 0) -> Iterator[os.DirEntry]:
+    """Yield directory entries for every per-student .txt file, in shard directories and the flat legacy layout."""
+    with os.scandir(_dir or STUDENTS_DIR) as it:
+        for entry in it:
+            if entry.name.lower().endswith('.txt') and entry.is_file():
+                yield entry
+            elif (include_shards and _depth < SHARD_LEVELS and len(entry.name) == SHARD_WIDTH
+                  and entry.is_dir()):
+                yield from iter_record_files(True, entry.path, _depth + 1)
+
+
+def _parse_many(paths: List[str], workers: Optional[int] = None) -> List[Optional[Tuple[str, dict]]]:
+    if len(paths) < PARALLEL_PARSE_THRESHOLD or workers == 1:
+        return [parse_student_file(p) for p in paths]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(parse_student_file, paths, chunksize=256))
+
+
+def _manifest_path() -> str:
+    return SQLITE_MANIFEST if INDEX_BACKEND == "sqlite" else MANIFEST
+
+
+def _load_manifest() -> Optional[dict]:
+    path = _manifest_path()
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as fh:
+        try:
+            return json.load(fh)
+        except json.JSONDecodeError:
+            return None
+
+
+def _write_manifest(manifest: dict):
+    path = _manifest_path()
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as fh:
+        json.dump(manifest, fh, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp, path)
+
+
+def rebuild_index_from_files(full: bool = False, workers: Optional[int] = None) -> int:
     """Rebuilds `students.json` from existing per-student .txt files.
-    Scans `students_records/` for `.txt` files, parses basic fields and writes a fresh index.
-    Returns the number of records written to the index."""
+    Scans `students_records/` for `.txt` files, parses basic fields and updates the index.
+    A per-backend manifest of (filename, size, mtime_ns) from the previous run lets
+    only new or changed files be re-parsed, and index entries with no record file
+    are dropped. `full=True`, a missing manifest or an empty index re-parses
+    everything and writes a fresh index. Large parses are spread over `workers`
+    processes.
+    Returns the number of records in the rebuilt index."""
     ensure_dir()
-    entries = {}
-    count = 0
-    for fname in os.listdir(STUDENTS_DIR):
-        if not fname.lower().endswith('.txt'):
-            continue
-        path = os.path.join(STUDENTS_DIR, fname)
-        try:
-            with open(path, 'r', encoding='utf-8') as fh:
-                content = fh.read()
-        except OSError:
-            continue
-        lines = content.splitlines()
-        name = None
-        class_num = 8
-        fav = None
-        intro_lines = []
-        in_intro = False
-        for line in lines:
-            if line.startswith('Name:'):
-                name = line.split(':', 1)[1].strip()
-            elif line.startswith('Class:'):
-                try:
-                    class_num = int(line.split(':', 1)[1].strip())
-                except Exception:
-                    class_num = 8
-            elif line.startswith('Favourite subject:') or line.startswith('Favorite subject:'):
-                fav = line.split(':', 1)[1].strip()
-            elif line.strip() == 'Brief intro:':
-                in_intro = True
-            elif in_intro:
-                intro_lines.append(line)
+    index = get_index()
+    if next(iter(index.iter_entries(limit=1)), None) is None:
+        full = True  # a new or emptied store has nothing to be incremental against
+    old_manifest = None if full else _load_manifest()
+    stats = {}
+    for entry in iter_record_files():
+        st = entry.stat()
+        stats[os.path.relpath(entry.path, STUDENTS_DIR)] = (st.st_size, st.st_mtime_ns)
+
+    if old_manifest is None:
+        to_parse = list(stats)
+    else:
+        to_parse = [fname for fname, (size, mtime_ns) in stats.items()
+                    if old_manifest.get(fname, [None, None])[:2] != [size, mtime_ns]]
+    parsed = _parse_many([os.path.join(STUDENTS_DIR, f) for f in to_parse], workers)
+
+    manifest = {} if old_manifest is None else {f: v for f, v in old_manifest.items() if f in stats}
+    updates = {}
+    for fname, result in zip(to_parse, parsed):
+        size, mtime_ns = stats[fname]
+        name, entry = result if result else (None, None)
+        manifest[fname] = [size, mtime_ns, name]
         if name:
-            intro = '\n'.join(intro_lines).strip()
-            entries[name] = {
-                'class': class_num,
-                'favourite_subject': fav or None,
-                'intro_preview': (intro or '')[:120]
-            }
-            count += 1
-    with open(JSON_INDEX, 'w', encoding='utf-8') as fh:
-        json.dump(entries, fh, indent=2, ensure_ascii=False)
-    return count
+            updates[name] = entry
+
+    present = {v[2] for v in manifest.values() if v[2]}
+    if old_manifest is None:
+        index.replace_all(updates)
+    else:
+        # Reconcile against the index itself, not the old manifest: a student
+        # saved after the last rebuild and then deleted was never in the manifest.
+        for name in set(index.as_dict()) - present:
+            index.delete(name)
+        index.put_many(updates)
+    _write_manifest(manifest)
+    return len(present)
+
+
+def migrate_to_sharded_layout() -> int:
+    """Move record files from the flat layout into shard directories.
+
+    The manifest is re-keyed as files move, so the next incremental rebuild
+    does not need to re-parse them. Returns the number of files moved.
+    """
+    ensure_dir()
+    manifest = _load_manifest()
+    moved = 0
+    for entry in list(iter_record_files(include_shards=False)):
+        stem = entry.name[:-len('.txt')]
+        target = _shard_path(sanitize_filename(stem))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(entry.path, target)
+        if manifest is not None and entry.name in manifest:
+            manifest[os.path.relpath(target, STUDENTS_DIR)] = manifest.pop(entry.name)
+        moved += 1
+    if manifest is not None:
+        _write_manifest(manifest)
+    return moved
+
+
+def benchmark_layout(n_files: int = 100000, n_opens: int = 2000) -> Dict[str, Dict[str, float]]:
+    """Time listing all record files and opening random ones, flat vs sharded, in a temp dir.
+
+    Returns `{layout: {"list_s": ..., "open_us": ...}}`.
+    """
+    import random
+    import shutil
+    import tempfile
+    import time
+
+    names = [f"student_{i:07d}" for i in range(n_files)]
+    sample = random.sample(names, min(n_opens, n_files))
+    results = {}
+    root = tempfile.mkdtemp(prefix="students_layout_")
+    try:
+        for layout in ("flat", "sharded"):
+            base = os.path.join(root, layout)
+            os.makedirs(base)
+            paths = {}
+            for name in names:
+                if layout == "flat":
+                    path = os.path.join(base, name + ".txt")
+                else:
+                    path = os.path.join(base, _shard_relpath(name))
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                open(path, "w").close()
+                paths[name] = path
+            start = time.perf_counter()
+            count = sum(1 for _, _, files in os.walk(base) for _ in files)
+            list_s = time.perf_counter() - start
+            assert count == n_files
+            start = time.perf_counter()
+            for name in sample:
+                with open(paths[name], "rb"):
+                    pass
+            open_us = (time.perf_counter() - start) / len(sample) * 1e6
+            results[layout] = {"list_s": list_s, "open_us": open_us}
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return results
+
+
+class AsyncStudentService:
+    """asyncio front-end for the record store.
+
+    File reads and writes run on a bounded thread pool, so a slow disk never
+    blocks the event loop. Index updates from concurrent `save_student` calls
+    are queued to a single writer task, which commits everything queued so far
+    as one `put_many`. All index access runs on one dedicated thread.
+
+        async with AsyncStudentService() as service:
+            await asyncio.gather(*(service.save_student(s) for s in students))
+    """
+
+    def __init__(self, max_workers: int = 8, max_batch: int = 1000):
+        self.max_workers = max_workers
+        self.max_batch = max_batch
+        self._pool = None
+        self._index_pool = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> "AsyncStudentService":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def start(self):
+        from concurrent.futures import ThreadPoolExecutor
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="students-io")
+        self._index_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="students-index")
+        self._queue = asyncio.Queue()
+        self._writer = asyncio.create_task(self._write_index())
+
+    async def close(self):
+        """Wait for queued index updates to be committed, then stop the workers."""
+        await self._queue.join()
+        self._writer.cancel()
+        try:
+            await self._writer
+        except asyncio.CancelledError:
+            pass
+        self._pool.shutdown()
+        self._index_pool.shutdown()
+
+    async def _run(self, pool, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+
+    async def save_student(self, student: Student, overwrite: bool = True) -> str:
+        """Write the student's file and wait until its index entry is committed. Returns path."""
+        path = await self._run(self._pool, write_student_file, student, overwrite)
+        committed = asyncio.get_running_loop().create_future()
+        await self._queue.put((student.name, index_entry(student), committed))
+        await committed
+        return path
+
+    async def read_student(self, name: str) -> str:
+        return await self._run(self._pool, read_student_file, name)
+
+    async def list_students(self) -> dict:
+        return await self._run(self._index_pool, list_students)
+
+    async def _write_index(self):
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            values = {name: entry for name, entry, _ in batch}
+            try:
+                await self._run(self._index_pool, lambda: get_index().put_many(values))
+            except Exception as exc:
+                for _, _, committed in batch:
+                    if not committed.done():
+                        committed.set_exception(exc)
+            else:
+                for _, _, committed in batch:
+                    if not committed.done():
+                        committed.set_result(None)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
+def student_from_row(row: dict) -> Optional[Student]:
+    """Build a Student from a CSV row, or return None if the row has no name."""
+    # Accept multiple header name variants for robustness
+    name = (row.get('name') or row.get('Name') or '').strip()
+    if not name:
+        return None
+    class_val = (row.get('class') or row.get('student_class') or row.get('Class') or '').strip()
+    try:
+        sc = int(class_val) if class_val != '' else 8
+    except ValueError:
+        sc = 8
+    fav = (row.get('favourite_subject') or row.get('favourite') or row.get('Favourite subject') or '').strip() or None
+    intro = (row.get('intro') or row.get('introduction') or '').strip() or None
+    return Student(name=name, student_class=sc, favourite_subject=fav, intro=intro)
 
 
 def import_from_csv(csv_path: str, overwrite: bool = True, encoding: str = 'utf-8') -> int:
@@ -154,35 +772,113 @@ def import_from_csv(csv_path: str, overwrite: bool = True, encoding: str = 'utf-
     with open(csv_path, newline='', encoding=encoding) as fh:
         reader = csv.DictReader(fh)
         for row in reader:
-            # Accept multiple header name variants for robustness
-            name = (row.get('name') or row.get('Name') or '').strip()
-            if not name:
+            s = student_from_row(row)
+            if s is None:
                 continue
-            class_val = (row.get('class') or row.get('student_class') or row.get('Class') or '').strip()
-            try:
-                sc = int(class_val) if class_val != '' else 8
-            except ValueError:
-                sc = 8
-            fav = (row.get('favourite_subject') or row.get('favourite') or row.get('Favourite subject') or '').strip() or None
-            intro = (row.get('intro') or row.get('introduction') or '').strip() or None
-            s = Student(name=name, student_class=sc, favourite_subject=fav, intro=intro)
             save_student_file(s, overwrite=overwrite)
             count += 1
     return count
 
 
+@dataclass
+class ImportStats:
+    rows: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+def bulk_import_from_csv(csv_path: str, overwrite: bool = True, encoding: str = 'utf-8',
+                         batch_size: int = 5000, commit_at_end: bool = False) -> ImportStats:
+    """Stream a CSV in chunks of `batch_size` rows and write each chunk in one go.
+
+    Per-student files of a chunk are written together, then the chunk's index
+    entries are committed as a single log record. With `commit_at_end` the index
+    is instead committed once, after the last chunk, as a fresh snapshot written
+    to a temp file and renamed into place.
+    Returns an ImportStats with row count and throughput.
+    """
+    import csv
+    import time
+    from itertools import islice
+
+    ensure_dir()
+    index = get_index()
+    stats = ImportStats()
+    pending: Dict[str, dict] = {}
+    made_dirs = set()
+    start = time.perf_counter()
+    with open(csv_path, newline='', encoding=encoding) as fh:
+        students = (s for s in map(student_from_row, csv.DictReader(fh)) if s is not None)
+        while True:
+            chunk = list(islice(students, batch_size))
+            if not chunk:
+                break
+            files = {}
+            values = {}
+            for s in chunk:
+                path = student_file_path(s.name)
+                if not overwrite:
+                    for existing in (path, legacy_student_file_path(s.name)):
+                        if existing in files or os.path.exists(existing):
+                            raise FileExistsError(f"File {existing} exists and overwrite is False")
+                files[path] = format_student_file(s)
+                values[s.name] = index_entry(s)
+            for path, content in files.items():
+                shard = os.path.dirname(path)
+                if shard not in made_dirs:
+                    os.makedirs(shard, exist_ok=True)
+                    made_dirs.add(shard)
+                with open(path, "w", encoding="utf-8") as out:
+                    out.write(content)
+            for name in values:
+                _remove_legacy_file(name)
+            if commit_at_end:
+                pending.update(values)
+            else:
+                index.put_many(values)
+            stats.rows += len(chunk)
+            stats.batches += 1
+    if commit_at_end and pending:
+        index.merge_snapshot(pending)
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
 if __name__ == "__main__":
     # CLI for simple operations: list, import CSV, or create sample data
     import argparse
     import csv
+    import sys
 
     parser = argparse.ArgumentParser(description='Manage student records (add/list/import)')
     parser.add_argument('--import-csv', dest='import_csv', help='Path to CSV file to import')
     parser.add_argument('--overwrite', action='store_true', help='Overwrite existing per-student files when importing')
+    parser.add_argument('--bulk', action='store_true', help='Import the CSV in batches, committing the index once per batch')
+    parser.add_argument('--batch-size', dest='batch_size', type=int, default=5000, help='Rows per batch for --bulk (default 5000)')
+    parser.add_argument('--commit-at-end', dest='commit_at_end', action='store_true', help='With --bulk, commit the index once after the last batch')
     parser.add_argument('--list', action='store_true', help='Print the students index (students.json)')
+    parser.add_argument('--format', choices=['json', 'ndjson', 'table'], default='json', help='Output format for --list')
+    parser.add_argument('--limit', type=int, help='With --list, print at most this many records')
+    parser.add_argument('--offset', type=int, default=0, help='With --list, skip this many records')
+    parser.add_argument('--cursor', help='With --list, start after the student with this name (printed as "next cursor")')
     parser.add_argument('--create-sample-csv', action='store_true', help='Write a sample CSV file (students_import_sample.csv)')
     parser.add_argument('--rebuild-index', action='store_true', help='Rebuild students.json from per-student .txt files')
+    parser.add_argument('--full', action='store_true', help='With --rebuild-index, re-parse every file instead of only changed ones')
+    parser.add_argument('--backend', choices=['json', 'sqlite'], default=INDEX_BACKEND, help='Index storage backend (default: json)')
+    parser.add_argument('--migrate-sqlite', dest='migrate_sqlite', action='store_true', help='Copy the JSON/.txt records into students.db')
+    parser.add_argument('--query', action='store_true', help='Print students matching --class/--subject/--prefix')
+    parser.add_argument('--class', dest='class_', type=int, help='Class filter for --query')
+    parser.add_argument('--subject', help='Favourite subject filter for --query')
+    parser.add_argument('--prefix', help='Name prefix filter for --query')
+    parser.add_argument('--migrate-layout', dest='migrate_layout', action='store_true', help='Move flat students_records/*.txt files into hashed shard directories')
+    parser.add_argument('--benchmark-layout', dest='benchmark_layout', type=int, metavar='N', help='Compare flat vs sharded listing/open latency with N files')
+    parser.add_argument('--compact', action='store_true', help='Fold students.log into the students.json snapshot')
     args = parser.parse_args()
+    INDEX_BACKEND = args.backend
 
     if args.create_sample_csv:
         sample_csv = os.path.join(os.path.dirname(__file__), 'students_import_sample.csv')
@@ -198,21 +894,56 @@ if __name__ == "__main__":
         if not os.path.exists(args.import_csv):
             print('CSV file not found:', args.import_csv)
             raise SystemExit(1)
-        added = import_from_csv(args.import_csv, overwrite=args.overwrite)
+        if args.bulk:
+            stats = bulk_import_from_csv(args.import_csv, overwrite=args.overwrite,
+                                         batch_size=args.batch_size, commit_at_end=args.commit_at_end)
+            added = stats.rows
+            print(f'{stats.rows} rows in {stats.batches} batches, {stats.seconds:.2f}s ({stats.rows_per_second:.0f} rows/s)')
+        else:
+            added = import_from_csv(args.import_csv, overwrite=args.overwrite)
+        compact_index()
         print(f'Imported {added} students from', args.import_csv)
         print('\nUpdated students index:')
         print(json.dumps(list_students(), indent=2, ensure_ascii=False))
         raise SystemExit(0)
 
     if args.rebuild_index:
-        written = rebuild_index_from_files()
+        written = rebuild_index_from_files(full=args.full)
         print(f'Rebuilt index from .txt files. {written} records written to', JSON_INDEX)
         print('\nUpdated students index:')
         print(json.dumps(list_students(), indent=2, ensure_ascii=False))
         raise SystemExit(0)
 
+    if args.migrate_sqlite:
+        migrated = migrate_to_sqlite()
+        print(f'Migrated {migrated} records to', SQLITE_DB)
+        raise SystemExit(0)
+
+    if args.query:
+        print(json.dumps(query_students(class_=args.class_, subject=args.subject, prefix=args.prefix),
+                         indent=2, ensure_ascii=False))
+        raise SystemExit(0)
+
+    if args.migrate_layout:
+        moved = migrate_to_sharded_layout()
+        print(f'Moved {moved} record files into shard directories under', STUDENTS_DIR)
+        raise SystemExit(0)
+
+    if args.benchmark_layout:
+        for layout, r in benchmark_layout(args.benchmark_layout).items():
+            print(f"{layout:>8}: list all {r['list_s'] * 1000:.1f} ms, open {r['open_us']:.1f} us/file")
+        raise SystemExit(0)
+
+    if args.compact:
+        compact_index()
+        print('Compacted index into', JSON_INDEX)
+        raise SystemExit(0)
+
     if args.list:
-        print(json.dumps(list_students(), indent=2, ensure_ascii=False))
+        last = write_students(iter_students(offset=args.offset, limit=args.limit, cursor=args.cursor),
+                              sys.stdout, fmt=args.format)
+        if args.limit is not None and last is not None:
+            print('next cursor:', last, file=sys.stderr)
         raise SystemExit(0)
 
     # Default behavior: create a few sample students if run without arguments